@@ -1,10 +1,16 @@
 if __name__ == "__main__":
-    import argparse
-    from functools import reduce
+    import sys
 
-    from pylox.lox import Lox
     from pylox.utilities.configuration import Debug
 
+    if len(sys.argv) == 2 and not sys.argv[1].startswith("-"):
+        # Fast path for the common `pylox FILE` invocation: skip importing and building the argument parser.
+        from pylox.lox import Lox
+        Lox(Debug.BACKTRACE).run_file(sys.argv[1])
+        sys.exit()
+
+    import argparse
+
     parser = argparse.ArgumentParser(
         prog="pylox",
         description="Yet another implementation of the Lox interpreter in Python",
@@ -32,12 +38,139 @@ if __name__ == "__main__":
         action="append",
         help="pylox debugging options, multiple --dbg arguments can be passed"
     )
+    parser.add_argument(
+        "--pipelined",
+        action="store_true",
+        help="parse, resolve and execute one top-level declaration at a time, so that output starts at once"
+    )
+    parser.add_argument(
+        "--coverage",
+        metavar="PREFIX",
+        type=str,
+        default=None,
+        help="record line coverage and write it to PREFIX.txt (annotated source) and PREFIX.json"
+    )
+    parser.add_argument(
+        "--snapshot",
+        metavar="SNAPSHOT",
+        type=str,
+        default=None,
+        help="start from the globals saved in SNAPSHOT instead of an empty environment"
+    )
+    parser.add_argument(
+        "--save-snapshot",
+        metavar="SNAPSHOT",
+        type=str,
+        default=None,
+        help="after running FILE or STRING, save the globals it defined to SNAPSHOT"
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="SOCKET",
+        type=str,
+        default=None,
+        help="run as a server executing scripts sent to the Unix domain socket SOCKET"
+    )
+    parser.add_argument(
+        "--preload",
+        metavar="FILE",
+        type=str,
+        default=list(),
+        action="append",
+        help="with --serve, compile FILE ahead of time and share it between workers, can be passed multiple times"
+    )
+    parser.add_argument(
+        "--connect",
+        metavar="SOCKET",
+        type=str,
+        default=None,
+        help="execute FILE or STRING on the server listening on SOCKET"
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="DIR",
+        type=str,
+        default=None,
+        help="run every .lox file under DIR in a pool of worker processes"
+    )
+    parser.add_argument(
+        "--batch-output",
+        metavar="DIR",
+        type=str,
+        default=None,
+        help="write the output of each batch job to DIR instead of multiplexing it"
+    )
+    parser.add_argument(
+        "--schedule",
+        metavar="DIR",
+        type=str,
+        default=None,
+        help="run every .lox file under DIR interleaved in this process under a round-robin scheduler"
+    )
+    parser.add_argument(
+        "--time-slice",
+        metavar="N",
+        type=int,
+        default=1000,
+        help="number of statements each script may execute before yielding under --schedule, defaults to 1000"
+    )
+    parser.add_argument(
+        "-j",
+        metavar="N",
+        dest="jobs",
+        type=int,
+        default=None,
+        help="number of worker processes for --batch (defaults to the number of cores), "
+             "or of scripts interleaved at once for --schedule (defaults to 64)"
+    )
     args, extra_args = parser.parse_known_args()
 
-    lox = Lox(reduce(lambda a, b: a | Debug[b], args.dbg, Debug.BACKTRACE))  # Collapse all flags passed.
-    if args.c:
-        lox.run(args.c)
-    elif args.source:
-        lox.run_file(args.source)
-    else:
-        lox.run_interactive()
+    if args.connect:  # The client must stay thin: do not import the interpreter.
+        if args.c is None and args.source is None:
+            parser.error("--connect requires FILE or -c STRING")
+        from pylox.client import run as run_remotely
+        run_remotely(args.connect, source=args.c, path=args.source)
+
+    debug_flags = Debug.BACKTRACE
+    for flag in args.dbg:  # Collapse all flags passed.
+        debug_flags |= Debug[flag]
+
+    if args.serve:
+        from pylox.server import serve
+        serve(args.serve, debug_flags, args.preload)
+        sys.exit()
+
+    if args.batch:
+        from pylox.batch import run_batch
+        sys.exit(run_batch(args.batch, jobs=args.jobs, output_directory=args.batch_output, debug_flags=debug_flags))
+
+    if args.schedule:
+        from pylox.scheduler import run_scheduled
+        sys.exit(run_scheduled(args.schedule, time_slice=args.time_slice, max_active=args.jobs, debug_flags=debug_flags))
+
+    from pylox.lox import Lox
+    from pylox.utilities import dump_internal
+
+    lox = Lox(debug_flags)
+    if args.coverage:
+        lox.enable_coverage()
+    if args.snapshot:
+        from pylox.snapshot import Snapshot
+        lox.restore(Snapshot.load(args.snapshot))
+    try:
+        if args.c:
+            lox.run(args.c, pipelined=args.pipelined)
+        elif args.source:
+            lox.run_file(args.source, pipelined=args.pipelined)
+        else:
+            lox.run_interactive()
+        if args.save_snapshot:
+            try:
+                lox.snapshot().save(args.save_snapshot)
+            except ValueError as error:
+                sys.exit(str(error))
+    finally:
+        if args.coverage:
+            lox.coverage_report().write(args.coverage)
+        if lox.debug_flags & Debug.ALLOCATIONS:
+            dump_internal("Allocation", lox.allocation_snapshot("at exit"))
@@ -0,0 +1,105 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import List, Optional, TextIO
+
+from pylox.lox import Lox
+from pylox.utilities.configuration import Debug
+from pylox.utilities.error import LoxCompileError
+
+
+@dataclass
+class JobResult:
+    name: str  # Path of the script relative to the batch directory.
+    output: str
+    errors: str
+    exit_code: int
+    wall_time: float
+
+
+# Each worker process owns a single Lox instance, kept warm across all the jobs it is handed.
+_worker_lox_instance: Optional[Lox] = None
+
+
+def _initialize_worker(debug_flags: Debug) -> None:
+    global _worker_lox_instance  # pylint: disable=global-statement, invalid-name
+    _worker_lox_instance = Lox(debug_flags)
+
+
+def _run_job(root: Path, path: Path) -> JobResult:
+    assert _worker_lox_instance is not None
+    start = perf_counter()
+    try:
+        with path.open("r") as fil:
+            result = _worker_lox_instance.compile(fil.read()).run()
+        output, errors, exit_code = result.output, result.errors, result.exit_code
+    except LoxCompileError as error:
+        output, errors, exit_code = "", error.report, 1
+    except Exception as error:  # pylint: disable=broad-except
+        output, errors, exit_code = "", f"Pylox crashed due to an internal {type(error).__name__}: {error}\n", 1
+    return JobResult(str(path.relative_to(root)), output, errors, exit_code, perf_counter() - start)
+
+
+def discover_jobs(root: Path) -> List[Path]:
+    return sorted(path for path in root.rglob("*.lox") if path.is_file())
+
+
+def write_prefixed(text: str, prefix: str, stream: TextIO) -> None:
+    for line in text.splitlines():
+        print(f"[{prefix}] {line}", file=stream)
+
+
+def run_batch(
+        directory: str,
+        *,
+        jobs: Optional[int] = None,
+        output_directory: Optional[str] = None,
+        debug_flags: Debug = Debug(0)
+) -> int:
+    """Run every .lox file under `directory` in a pool of worker processes and print a summary.
+
+    :param directory: directory to search recursively for scripts
+    :type directory: str
+    :param jobs: number of worker processes, defaults to the number of cores
+    :type jobs: Optional[int], optional
+    :param output_directory: if given, write each job's output and errors (if any) to `<name>.out`
+        and `<name>.err` under this directory; otherwise multiplex them prefixed with the job's name
+    :type output_directory: Optional[str], optional
+    :param debug_flags: debugging options of the workers' interpreters, defaults to Debug(0)
+    :type debug_flags: Debug, optional
+    :return: 0 if all jobs succeeded, 1 otherwise
+    :rtype: int
+    """
+    root = Path(directory).resolve()
+    paths = discover_jobs(root)
+    results: List[JobResult] = list()
+    start = perf_counter()
+
+    with ProcessPoolExecutor(
+            max_workers=jobs or os.cpu_count(),
+            initializer=_initialize_worker,
+            initargs=(debug_flags,)
+    ) as executor:
+        for result in executor.map(_run_job, (root for _ in paths), paths):  # Results arrive in job order.
+            results.append(result)
+            if output_directory is None:
+                write_prefixed(result.output, result.name, sys.stdout)
+                write_prefixed(result.errors, result.name, sys.stderr)
+            else:
+                base = Path(output_directory) / result.name
+                base.parent.mkdir(parents=True, exist_ok=True)
+                base.with_suffix(".out").write_text(result.output)
+                if result.errors:
+                    base.with_suffix(".err").write_text(result.errors)
+
+    failures = [result for result in results if result.exit_code != 0]
+    print(f"\n{len(results)} jobs run in {perf_counter() - start:.3f} s, {len(failures)} failed.")
+    for result in failures:
+        print(f"\tFAILED ({result.exit_code}): {result.name}")
+    print("Slowest jobs:")
+    for result in sorted(results, key=lambda result: -result.wall_time)[:5]:
+        print(f"\t{result.wall_time * 1000:>10.3f} ms: {result.name}")
+    return 1 if failures else 0
@@ -0,0 +1,27 @@
+# This module deliberately imports nothing from the rest of pylox, so that forwarding
+# a script to a running server costs no more than Python startup itself.
+
+import json
+import os
+import socket
+import sys
+from typing import Any, Dict, Optional
+
+
+def request(socket_path: str, *, source: Optional[str] = None, path: Optional[str] = None) -> Dict[str, Any]:
+    """Send a script, either as source text or as a path to a file, to a server and await its result."""
+    payload = {"source": source} if source is not None else {"path": os.path.abspath(str(path))}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        with sock.makefile("rwb") as stream:
+            stream.write(json.dumps(payload).encode() + b"\n")
+            stream.flush()
+            return json.loads(stream.readline())
+
+
+def run(socket_path: str, *, source: Optional[str] = None, path: Optional[str] = None) -> None:
+    """Forward the output, errors and exit code of a script executed by a server."""
+    response = request(socket_path, source=source, path=path)
+    sys.stdout.write(response["output"])
+    sys.stderr.write(response["errors"])
+    sys.exit(response["exit_code"])
@@ -1,4 +1,5 @@
 from abc import ABC
+from copy import copy
 from itertools import repeat
 from typing import TYPE_CHECKING, Optional, Sequence
 
@@ -22,17 +23,25 @@ class LoxCallable(ABC):
 
 
 class LoxFunction(LoxCallable):
-    def __init__(self, declaration: AnonymousFunctionExpr, closure: RawStack[LoxIdentifier, LoxObject]) -> None:
+    def __init__(
+            self,
+            declaration: AnonymousFunctionExpr,
+            closure: RawStack[LoxIdentifier, LoxObject],
+            bound_instance: Optional["LoxInstance"] = None
+    ) -> None:
         self.params = declaration.params
         self.arity = len(self.params)
         self.body = declaration.body
         self.closure = closure
-        self.bound_instance: Optional["LoxInstance"] = None
+        self.bound_instance = bound_instance
         self.kind = declaration.kind
 
     def bind_to_instance(self, instance: Optional["LoxInstance"]) -> "LoxFunction":
-        self.bound_instance = instance
-        return self
+        """Return a copy of this function bound to `instance`. The function itself, which may
+        be shared by every instance of a class, is left untouched."""
+        bound = copy(self)
+        bound.bound_instance = instance
+        return bound
 
 
 class LoxReturn(Exception):
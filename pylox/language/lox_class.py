@@ -57,7 +57,7 @@ class LoxInstance(DynamicallyResolved):
             return super().get(ident)
         resolved = self._class.get(ident)
         if isinstance(resolved, LoxFunction):
-            resolved.bind_to_instance(self)
+            return resolved.bind_to_instance(self)
         return resolved
 
     def __str__(self) -> str:
@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+
+from pylox.language.lox_native import LoxNativeError, native
+from pylox.language.lox_types import LoxObject
+
+
+class LoxIndexable(ABC):
+    """Base class of builtin collections supporting `collection[index]` reads and writes.
+
+    Invalid indices are reported by raising `LoxNativeError`."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    @abstractmethod
+    def get_item(self, index: LoxObject) -> LoxObject:
+        ...
+
+    @abstractmethod
+    def set_item(self, index: LoxObject, value: LoxObject) -> None:
+        ...
+
+
+@native("len", 1)
+def _len(sequence: LoxObject) -> float:
+    if isinstance(sequence, (LoxIndexable, str)):
+        return float(len(sequence))
+    raise LoxNativeError("Can only take the length of lists, maps and strings.")
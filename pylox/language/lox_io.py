@@ -0,0 +1,183 @@
+"""File and standard input natives.
+
+Files are read line by line, either one line per `readline(file)` call or lazily through the
+iterator returned by `lines(file)`, so that a program may process inputs much larger than memory.
+Lines are returned without their line break, and the end of a file is signalled by nil."""
+
+import io
+import mmap
+import sys
+from typing import IO, Iterator, NoReturn, Optional, Union
+
+from pylox.language.lox_iterator import LoxIterator
+from pylox.language.lox_native import LoxNativeError, native
+from pylox.language.lox_types import LoxObject, lox_object_to_str
+
+# Large buffers make writing many short lines cheap: they are flushed to the file in big chunks.
+BUFFER_SIZE = 1 << 16
+
+_MODES = ("r", "w", "a")
+
+
+class LoxFile:
+    """A file opened with `open(path, mode)`."""
+
+    def __init__(self, name: str, stream: IO[str], writable: bool) -> None:
+        self.name = name
+        self._stream = stream
+        self._writable = writable
+
+    def readline(self) -> Optional[str]:
+        """Read the next line without its line break, or None at the end of the file."""
+        if self._writable:
+            raise LoxNativeError("Cannot read from a file opened for writing.")
+        try:
+            line = self._readline()
+        except UnicodeDecodeError:
+            raise LoxNativeError(f"Cannot decode {self.name} as UTF-8.") from None
+        except ValueError:
+            raise LoxNativeError("Cannot read from a closed file.") from None
+        if not line:
+            return None
+        if line.endswith("\n"):
+            line = line[:-2] if line.endswith("\r\n") else line[:-1]
+        return line
+
+    def _readline(self) -> str:
+        return self._stream.readline()
+
+    def lines(self, close: bool = False) -> Iterator[str]:
+        """Lazily iterate over the remaining lines, closing the file at its end if `close`."""
+        while (line := self.readline()) is not None:
+            yield line
+        if close:
+            self.close()
+
+    def write(self, text: str) -> None:
+        if not self._writable:
+            raise LoxNativeError("Cannot write to a file opened for reading.")
+        try:
+            self._stream.write(text)
+        except ValueError:
+            raise LoxNativeError("Cannot write to a closed file.") from None
+
+    def close(self) -> None:
+        self._stream.close()
+
+    def __str__(self) -> str:
+        return f"<file {self.name}>"
+
+    def __reduce__(self) -> NoReturn:
+        raise TypeError("files are bound to the running process")
+
+
+class LoxStandardInput(LoxFile):
+    """The standard input returned by `stdin()`.
+
+    Closing it only closes this handle: the standard input of the process stays open, for the
+    handles returned by later calls to `stdin()` as well as for the application embedding pylox."""
+
+    def __init__(self) -> None:
+        super().__init__("<stdin>", sys.stdin, writable=False)
+        self._closed = False
+
+    def _readline(self) -> str:
+        if self._closed:
+            raise ValueError("I/O operation on closed file.")
+        return super()._readline()
+
+    def close(self) -> None:
+        self._closed = True
+
+
+class LoxMappedFile(LoxFile):
+    """A file opened for reading with `mmap(path)`, which maps it into memory.
+
+    Pages of the file are loaded by the operating system as lines are read from them, instead of
+    being copied through the buffers of a regular file, and each line is decoded on its own."""
+
+    def __init__(self, name: str, mapping: Union[mmap.mmap, io.BytesIO]) -> None:
+        super().__init__(name, mapping, writable=False)  # type: ignore
+        self._mapping = mapping
+
+    def _readline(self) -> str:
+        return self._mapping.readline().decode("utf-8")
+
+
+def _open(path: str, mode: str) -> LoxFile:
+    try:
+        stream = open(path, mode, buffering=BUFFER_SIZE, encoding="utf-8")
+    except OSError as error:
+        raise LoxNativeError(f"Cannot open '{path}' ({error.strerror}).") from None
+    return LoxFile(path, stream, writable=mode != "r")
+
+
+def _expect_file(file: LoxObject, operation: str) -> LoxFile:
+    if not isinstance(file, LoxFile):
+        raise LoxNativeError(f"Can only {operation} files.")
+    return file
+
+
+def _expect_path(path: LoxObject) -> str:
+    if not isinstance(path, str):
+        raise LoxNativeError("File paths must be strings.")
+    return path
+
+
+@native("open", 2)
+def _open_native(path: LoxObject, mode: LoxObject) -> LoxFile:
+    """Open a file for reading ("r"), writing ("w") or appending ("a")."""
+    if mode not in _MODES:
+        raise LoxNativeError("File mode must be 'r', 'w' or 'a'.")
+    return _open(_expect_path(path), mode)  # type: ignore
+
+
+@native("mmap", 1)
+def _mmap(path: LoxObject) -> LoxMappedFile:
+    """Open a file for reading by mapping it into memory."""
+    checked_path = _expect_path(path)
+    try:
+        with open(checked_path, "rb") as fil:
+            try:
+                mapping: Union[mmap.mmap, io.BytesIO] = mmap.mmap(fil.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                mapping = io.BytesIO()  # Empty files cannot be mapped.
+    except OSError as error:
+        raise LoxNativeError(f"Cannot open '{checked_path}' ({error.strerror}).") from None
+    return LoxMappedFile(checked_path, mapping)
+
+
+@native("stdin", 0)
+def _stdin() -> LoxStandardInput:
+    return LoxStandardInput()
+
+
+@native("readline", 1)
+def _readline(file: LoxObject) -> Optional[str]:
+    return _expect_file(file, "read lines from").readline()
+
+
+@native("lines", 1)
+def _lines(source: LoxObject) -> LoxIterator:
+    """Iterate lazily over the lines of a file, or of the file at a path, which is closed at its end."""
+    if isinstance(source, str):
+        return LoxIterator(_open(source, "r").lines(close=True))
+    return LoxIterator(_expect_file(source, "read lines from").lines())
+
+
+@native("write", 2)
+def _write(file: LoxObject, value: LoxObject) -> None:
+    """Write a value to a file, converted to a string as `print` would."""
+    _expect_file(file, "write to").write(lox_object_to_str(value))
+
+
+@native("writeline", 2)
+def _writeline(file: LoxObject, value: LoxObject) -> None:
+    """Write a value to a file, followed by a line break."""
+    _expect_file(file, "write to").write(f"{lox_object_to_str(value)}\n")
+
+
+@native("close", 1)
+def _close(file: LoxObject) -> None:
+    """Close a file, flushing what was written to it."""
+    _expect_file(file, "close").close()
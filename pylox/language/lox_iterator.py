@@ -0,0 +1,57 @@
+from typing import Iterator, NoReturn
+
+from pylox.language.lox_list import LoxList
+from pylox.language.lox_map import LoxMap
+from pylox.language.lox_native import LoxNativeError, native
+from pylox.language.lox_types import LoxObject
+from pylox.language.lox_vec import LoxVec
+
+
+class LoxIterator:
+    """A lazy sequence of Lox objects, such as the lines of a file, consumed with `next(iterator)`.
+
+    Elements are only produced as they are consumed, so that iterating over a sequence takes
+    constant memory however long it is."""
+
+    def __init__(self, iterator: Iterator[LoxObject]) -> None:
+        self.iterator = iterator
+
+    def __str__(self) -> str:
+        return "<iterator>"
+
+    def __reduce__(self) -> NoReturn:
+        raise TypeError("iterators are bound to the running process")
+
+
+@native("next", 1)
+def _next(iterator: LoxObject) -> LoxObject:
+    """Advance an iterator, returning its next element, or nil once it is exhausted."""
+    if not isinstance(iterator, LoxIterator):
+        raise LoxNativeError("Can only advance iterators.")
+    return next(iterator.iterator, None)
+
+
+def lox_iteration(sequence: LoxObject) -> Iterator[LoxObject]:
+    """Iterate over the elements of a Lox sequence, as a for-each loop does.
+
+    Lists are iterated over live, so that elements appended by the loop are visited too. Maps
+    yield their keys as they were when the loop started, in insertion order, and strings their
+    characters. Iterators are consumed."""
+    if isinstance(sequence, LoxList):
+        return iter(sequence.elements)
+    if isinstance(sequence, LoxMap):
+        return iter([key for _, key in sequence.entries])
+    if isinstance(sequence, str):
+        return iter(sequence)
+    if isinstance(sequence, LoxIterator):
+        return sequence.iterator
+    if isinstance(sequence, LoxVec):
+        return iter(sequence.array.tolist())
+    raise LoxNativeError("Can only iterate over lists, maps, strings, vectors and iterators.")
+
+
+def lox_range(start: LoxObject, end: LoxObject) -> Iterator[float]:
+    """Iterate over the integers from `start` up to, but excluding, `end`."""
+    if not (isinstance(start, float) and start.is_integer() and isinstance(end, float) and end.is_integer()):
+        raise LoxNativeError("Range bounds must be integers.")
+    return map(float, range(int(start), int(end)))
@@ -0,0 +1,55 @@
+from reprlib import recursive_repr
+from typing import List
+
+from pylox.language.lox_indexable import LoxIndexable
+from pylox.language.lox_native import LoxNativeError, native
+from pylox.language.lox_types import LoxObject, lox_object_to_repr, lox_object_to_str
+
+
+class LoxList(LoxIndexable):
+    """A dynamic array of Lox objects, created with `[a, b, c]` and indexed with `list[i]`."""
+
+    def __init__(self, elements: List[LoxObject]) -> None:
+        self.elements = elements
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def get_item(self, index: LoxObject) -> LoxObject:
+        return self.elements[self.index(index)]
+
+    def set_item(self, index: LoxObject, value: LoxObject) -> None:
+        self.elements[self.index(index)] = value
+
+    def index(self, index: LoxObject) -> int:
+        """Validate a Lox index into this list, returning it as a Python index."""
+        if not isinstance(index, float) or not index.is_integer():
+            raise LoxNativeError("List index must be an integer.")
+        if not 0 <= index < len(self.elements):
+            raise LoxNativeError("List index out of range.")
+        return int(index)
+
+    @recursive_repr("[...]")
+    def __str__(self) -> str:
+        return f"[{', '.join(map(lox_element_to_str, self.elements))}]"
+
+
+def lox_element_to_str(obj: LoxObject) -> str:
+    """Represent an element of a collection, quoting strings to tell them apart from other objects."""
+    return lox_object_to_repr(obj) if isinstance(obj, str) else lox_object_to_str(obj)
+
+
+@native("push", 2)
+def _push(lox_list: LoxObject, value: LoxObject) -> None:
+    if not isinstance(lox_list, LoxList):
+        raise LoxNativeError("Can only push to lists.")
+    lox_list.elements.append(value)
+
+
+@native("pop", 1)
+def _pop(lox_list: LoxObject) -> LoxObject:
+    if not isinstance(lox_list, LoxList):
+        raise LoxNativeError("Can only pop from lists.")
+    if not lox_list.elements:
+        raise LoxNativeError("Cannot pop from an empty list.")
+    return lox_list.elements.pop()
@@ -0,0 +1,82 @@
+from reprlib import recursive_repr
+from typing import Dict, Tuple, Type
+
+from pylox.language.lox_indexable import LoxIndexable
+from pylox.language.lox_list import LoxList, lox_element_to_str
+from pylox.language.lox_native import LoxNativeError, native
+from pylox.language.lox_types import LoxObject, LoxPrimitive
+
+# Keys are stored along with their type so that they hash consistently with `lox_equality()`,
+# which never considers objects of different types equal. Python, however, has `1 == True`.
+MapKey = Tuple[Type[LoxPrimitive], LoxPrimitive]
+
+
+class LoxMap(LoxIndexable):
+    """A hash map from Lox primitives to Lox objects, created with `map()` and indexed with `map[key]`."""
+
+    def __init__(self) -> None:
+        self.entries: Dict[MapKey, LoxObject] = dict()
+
+    @staticmethod
+    def key(key: LoxObject) -> MapKey:
+        """Validate a Lox object as a key, returning its hashable form."""
+        if key is not None and not isinstance(key, (float, str, bool)):
+            raise LoxNativeError("Map keys must be numbers, strings, booleans or nil.")
+        return type(key), key
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get_item(self, index: LoxObject) -> LoxObject:
+        try:
+            return self.entries[self.key(index)]
+        except KeyError:
+            raise LoxNativeError(f"Undefined key {lox_element_to_str(index)}.") from None
+
+    def set_item(self, index: LoxObject, value: LoxObject) -> None:
+        self.entries[self.key(index)] = value
+
+    @recursive_repr("{...}")
+    def __str__(self) -> str:
+        items = (
+            f"{lox_element_to_str(key)}: {lox_element_to_str(value)}" for (_, key), value in self.entries.items()
+        )
+        return f"{{{', '.join(items)}}}"
+
+
+def _expect_map(lox_map: LoxObject, operation: str) -> LoxMap:
+    if not isinstance(lox_map, LoxMap):
+        raise LoxNativeError(f"Can only {operation} maps.")
+    return lox_map
+
+
+@native("map", 0)
+def _map() -> LoxMap:
+    return LoxMap()
+
+
+@native("has", 2)
+def _has(lox_map: LoxObject, key: LoxObject) -> bool:
+    checked_map = _expect_map(lox_map, "look up keys of")
+    return checked_map.key(key) in checked_map.entries
+
+
+@native("remove", 2)
+def _remove(lox_map: LoxObject, key: LoxObject) -> LoxObject:
+    """Remove a key from a map, returning its value."""
+    checked_map = _expect_map(lox_map, "remove keys from")
+    try:
+        return checked_map.entries.pop(checked_map.key(key))
+    except KeyError:
+        raise LoxNativeError(f"Undefined key {lox_element_to_str(key)}.") from None
+
+
+@native("keys", 1)
+def _keys(lox_map: LoxObject) -> LoxList:
+    """List the keys of a map, in insertion order."""
+    return LoxList([key for _, key in _expect_map(lox_map, "list the keys of").entries])
+
+
+@native("values", 1)
+def _values(lox_map: LoxObject) -> LoxList:
+    return LoxList(list(_expect_map(lox_map, "list the values of").entries.values()))
@@ -0,0 +1,137 @@
+"""Math native functions, mapping to Python's `math` and `random` modules.
+
+Functions of one number also accept a list of numbers, yielding the list of their results, and
+a vector, yielding a vector: a whole sequence is then processed by a single call rather than by a
+Lox loop. Like the arithmetic operators, they yield infinities and NaNs instead of raising
+runtime errors on overflows and invalid operations."""
+
+import math
+import random
+from typing import Callable, List
+
+from pylox.language.lox_list import LoxList
+from pylox.language.lox_native import LoxNativeError, native
+from pylox.language.lox_types import LoxObject
+from pylox.language.lox_vec import LoxVec, vector_function
+
+MathFunction = Callable[[float], float]
+
+
+def _total(function: MathFunction) -> MathFunction:
+    """Wrap a function of the `math` module to yield NaN on domain errors and infinity on overflows."""
+    def total(number: float) -> float:
+        try:
+            return function(number)
+        except ValueError:
+            return math.nan
+        except OverflowError:
+            return math.inf
+    return total
+
+
+def _finite_only(function: Callable[[float], int]) -> MathFunction:
+    """Wrap a rounding function, which rejects infinities and NaNs, to return them unchanged."""
+    def rounding(number: float) -> float:
+        return float(function(number)) if math.isfinite(number) else number
+    return rounding
+
+
+def _log(number: float) -> float:
+    if number == 0:
+        return -math.inf  # Rather than a domain error, as NumPy does for vectors.
+    try:
+        return math.log(number)
+    except ValueError:
+        return math.nan
+
+
+def _expect_numbers(elements: List[LoxObject], operation: str) -> List[float]:
+    if not all(type(element) is float for element in elements):
+        raise LoxNativeError(f"Can only {operation} numbers.")
+    return elements  # type: ignore
+
+
+def _register_unary(name: str, function: MathFunction, vector_name: str) -> None:
+    def apply(argument: LoxObject) -> LoxObject:
+        if type(argument) is float:
+            return function(argument)
+        if isinstance(argument, LoxList):
+            return LoxList(list(map(function, _expect_numbers(argument.elements, f"take the {name} of"))))
+        if isinstance(argument, LoxVec):
+            return vector_function(vector_name, argument)
+        raise LoxNativeError(f"Can only take the {name} of numbers, lists and vectors.")
+    native(name, 1)(apply)
+
+
+_register_unary("sqrt", _total(math.sqrt), "sqrt")
+_register_unary("floor", _finite_only(math.floor), "floor")
+_register_unary("ceil", _finite_only(math.ceil), "ceil")
+_register_unary("abs", abs, "absolute")
+_register_unary("sin", _total(math.sin), "sin")
+_register_unary("cos", _total(math.cos), "cos")
+_register_unary("tan", _total(math.tan), "tan")
+_register_unary("asin", _total(math.asin), "arcsin")
+_register_unary("acos", _total(math.acos), "arccos")
+_register_unary("atan", _total(math.atan), "arctan")
+_register_unary("exp", _total(math.exp), "exp")
+_register_unary("log", _log, "log")
+
+
+@native("atan2", 2)
+def _atan2(y: LoxObject, x: LoxObject) -> float:
+    if type(y) is not float or type(x) is not float:
+        raise LoxNativeError("Can only take the atan2 of numbers.")
+    return math.atan2(y, x)
+
+
+def _sequence(arguments: List[LoxObject], description: str) -> List[float]:
+    """The numbers reduced by `min()` and `max()`: either the arguments, or the elements of a single list."""
+    if len(arguments) == 1 and isinstance(arguments[0], LoxList):
+        arguments = arguments[0].elements
+    if not arguments:
+        raise LoxNativeError(f"Cannot take the {description} of an empty list.")
+    return _expect_numbers(arguments, f"take the {description} of")
+
+
+@native("min", 1, variadic=True)
+def _min(*arguments: LoxObject) -> float:
+    """The minimum of numbers, or of the elements of a list or vector."""
+    if len(arguments) == 1 and isinstance(arguments[0], LoxVec):
+        if not len(arguments[0]):
+            raise LoxNativeError("Cannot take the minimum of an empty vector.")
+        return float(arguments[0].array.min())
+    return min(_sequence(list(arguments), "minimum"))
+
+
+@native("max", 1, variadic=True)
+def _max(*arguments: LoxObject) -> float:
+    """The maximum of numbers, or of the elements of a list or vector."""
+    if len(arguments) == 1 and isinstance(arguments[0], LoxVec):
+        if not len(arguments[0]):
+            raise LoxNativeError("Cannot take the maximum of an empty vector.")
+        return float(arguments[0].array.max())
+    return max(_sequence(list(arguments), "maximum"))
+
+
+@native("sum", 1)
+def _sum(sequence: LoxObject) -> float:
+    """The sum of the elements of a list or vector, which is 0 if it is empty."""
+    if isinstance(sequence, LoxVec):
+        return float(sequence.array.sum())
+    if not isinstance(sequence, LoxList):
+        raise LoxNativeError("Can only sum lists and vectors.")
+    return math.fsum(_expect_numbers(sequence.elements, "sum"))
+
+
+@native("random", 0)
+def _random() -> float:
+    """A pseudo-random number in [0, 1)."""
+    return random.random()
+
+
+@native("seed", 1)
+def _seed(seed: LoxObject) -> None:
+    """Seed the generator used by `random()`, making the numbers it yields reproducible."""
+    if type(seed) is not float:
+        raise LoxNativeError("Can only seed with a number.")
+    random.seed(seed)
@@ -0,0 +1,67 @@
+from typing import Any, Callable, Dict, Tuple
+
+from pylox.language.lox_callable import LoxCallable
+from pylox.language.lox_types import LoxIdentifier, LoxObject
+
+NativeImplementation = Callable[..., LoxObject]
+
+
+class LoxNativeError(Exception):
+    """Raised by a native function to report a runtime error at its call site."""
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message)
+        self.message = message
+
+
+class LoxNativeFunction(LoxCallable):
+    """A function implemented in Python, available to every Lox program as a global.
+
+    A variadic native takes `arity` arguments or more."""
+
+    def __init__(self, name: str, arity: int, function: NativeImplementation, variadic: bool = False) -> None:
+        self.name = name
+        self.arity = arity
+        self.params = ()
+        self.function = function
+        self.variadic = variadic
+
+    def __repr__(self) -> str:
+        return f"<native function {self.name}>"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Natives are singletons: pickle them by name so that snapshots refer to the running process' own.
+        return (native_function, (self.name, ))
+
+
+# Natives are bound to negative identifiers, which the resolver never hands out, in order of registration.
+_NATIVES: Dict[str, LoxNativeFunction] = dict()
+_NATIVE_IDS: Dict[str, LoxIdentifier] = dict()
+
+
+def native(
+        name: str, arity: int, *, variadic: bool = False
+) -> Callable[[NativeImplementation], NativeImplementation]:
+    """Register the decorated function as a native function named `name` taking `arity` arguments,
+    or at least `arity` arguments if `variadic`."""
+    def register(function: NativeImplementation) -> NativeImplementation:
+        if name in _NATIVES:
+            raise ValueError(f"Native function '{name}' is already defined.")
+        _NATIVES[name] = LoxNativeFunction(name, arity, function, variadic)
+        _NATIVE_IDS[name] = LoxIdentifier(-len(_NATIVES))
+        return function
+    return register
+
+
+def native_function(name: str) -> LoxNativeFunction:
+    return _NATIVES[name]
+
+
+def native_ids() -> Dict[str, LoxIdentifier]:
+    """The identifiers of all native functions, by name."""
+    return dict(_NATIVE_IDS)
+
+
+def native_environment() -> Dict[LoxIdentifier, LoxObject]:
+    """A global environment frame binding every native function to its identifier."""
+    return {_NATIVE_IDS[name]: function for name, function in _NATIVES.items()}
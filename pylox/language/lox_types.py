@@ -1,14 +1,22 @@
+import sys
 from enum import Enum, auto
 from typing import TYPE_CHECKING, NewType, Optional, Union
 
 if TYPE_CHECKING:
     from pylox.language.lox_callable import LoxCallable
     from pylox.language.lox_class import LoxClass, LoxInstance
+    from pylox.language.lox_io import LoxFile
+    from pylox.language.lox_iterator import LoxIterator
+    from pylox.language.lox_list import LoxList
+    from pylox.language.lox_map import LoxMap
+    from pylox.language.lox_vec import LoxVec
     from pylox.parsing.expr import VariableExpr
 
 LoxLiteral = Union[str, float]
 LoxPrimitive = Union[float, str, bool, None]
-LoxObject = Union[LoxPrimitive, "VariableExpr", "LoxCallable", "LoxInstance"]
+LoxObject = Union[
+    LoxPrimitive, "VariableExpr", "LoxCallable", "LoxInstance", "LoxList", "LoxMap", "LoxVec", "LoxFile", "LoxIterator"
+]
 
 LoxIdentifier = NewType("LoxIdentifier", int)
 
@@ -66,12 +74,26 @@ def lox_truth(obj: LoxObject) -> bool:
 
 
 def lox_equality(left: LoxObject, right: LoxObject) -> bool:
-    """Evaluate if two Lox objects are equal."""
+    """Evaluate if two Lox objects are equal.
+
+    Python compares strings by identity before comparing their contents, and string literals as
+    well as short strings produced at run time are interned (see `lox_concatenation()`), so most
+    equal strings are told apart without looking at their characters."""
     if type(left) is type(right):
         return left == right
     return False
 
 
+# Strings up to this length that are produced by concatenation are interned: interning costs a
+# hash and a lookup, which is repaid by the identity checks it allows for comparisons and map keys.
+INTERNED_LENGTH = 64
+
+
+def lox_concatenation(left: str, right: str) -> str:
+    result = left + right
+    return sys.intern(result) if len(result) <= INTERNED_LENGTH else result
+
+
 def lox_division(left: float, right: float) -> float:
     try:
         return left / right
@@ -0,0 +1,118 @@
+"""An optional numeric vector type backed by NumPy.
+
+The type is only available when NumPy is installed. NumPy is imported on first use rather than
+along with pylox, so that it does not weigh on the startup time of programs not using vectors."""
+
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any, Callable, Union
+
+from pylox.language.lox_indexable import LoxIndexable
+from pylox.language.lox_list import LoxList
+from pylox.language.lox_native import LoxNativeError, native
+from pylox.language.lox_types import LoxObject, lox_object_to_str
+
+if TYPE_CHECKING:
+    import numpy
+
+VECTORS_AVAILABLE = find_spec("numpy") is not None
+
+Operand = Union["numpy.ndarray", float]
+
+
+def _numpy() -> Any:
+    import numpy  # pylint: disable=import-outside-toplevel
+    return numpy
+
+
+class LoxVec(LoxIndexable):
+    """A fixed-length vector of numbers, created with `vec(list)`.
+
+    Arithmetic and comparison operators apply elementwise between two vectors, or between a vector
+    and a number. Comparisons yield vectors of ones and zeros."""
+
+    def __init__(self, array: "numpy.ndarray") -> None:
+        self.array = array
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def get_item(self, index: LoxObject) -> LoxObject:
+        return float(self.array[self.index(index)])
+
+    def set_item(self, index: LoxObject, value: LoxObject) -> None:
+        position = self.index(index)
+        if not isinstance(value, float):
+            raise LoxNativeError("Vector elements must be numbers.")
+        self.array[position] = value
+
+    def index(self, index: LoxObject) -> int:
+        """Validate a Lox index into this vector, returning it as a Python index."""
+        if not isinstance(index, float) or not index.is_integer():
+            raise LoxNativeError("Vector index must be an integer.")
+        if not 0 <= index < len(self.array):
+            raise LoxNativeError("Vector index out of range.")
+        return int(index)
+
+    def __str__(self) -> str:
+        return f"vec[{', '.join(lox_object_to_str(float(element)) for element in self.array)}]"
+
+
+def vector_division(left: Operand, right: Operand) -> "numpy.ndarray":
+    """Divide elementwise, yielding NaN on division by zero like `lox_division()`."""
+    numpy = _numpy()
+    return numpy.where(numpy.equal(right, 0), numpy.nan, numpy.divide(left, right))
+
+
+def elementwise(operation: Callable[[Operand, Operand], Any], left: LoxObject, right: LoxObject) -> LoxVec:
+    """Apply a binary operation elementwise to two vectors, or to a vector and a number.
+
+    Raises `LoxNativeError` on any other operands."""
+    if not isinstance(left, (LoxVec, float)) or not isinstance(right, (LoxVec, float)):
+        raise LoxNativeError("Operands must be vectors or numbers.")
+    left_operand = left.array if isinstance(left, LoxVec) else left
+    right_operand = right.array if isinstance(right, LoxVec) else right
+    if isinstance(left, LoxVec) and isinstance(right, LoxVec) and len(left) != len(right):
+        raise LoxNativeError("Vectors must have the same length.")
+    numpy = _numpy()
+    with numpy.errstate(all="ignore"):  # Overflows and invalid operations yield infinities and NaNs.
+        result = operation(left_operand, right_operand)
+    return LoxVec(numpy.asarray(result, dtype=numpy.float64))
+
+
+def vector_function(name: str, vector: LoxVec) -> LoxVec:
+    """Apply the NumPy function `name` to every element of a vector, yielding infinities and NaNs
+    rather than raising on overflows and invalid operations."""
+    numpy = _numpy()
+    with numpy.errstate(all="ignore"):
+        return LoxVec(getattr(numpy, name)(vector.array))
+
+
+def _expect_vec(vector: LoxObject, operation: str) -> LoxVec:
+    if not isinstance(vector, LoxVec):
+        raise LoxNativeError(f"Can only {operation} vectors.")
+    return vector
+
+
+def _vec(elements: LoxObject) -> LoxVec:
+    """Create a vector from a list of numbers, or copy a vector."""
+    numpy = _numpy()
+    if isinstance(elements, LoxVec):
+        return LoxVec(elements.array.copy())
+    if not isinstance(elements, LoxList):
+        raise LoxNativeError("Can only create vectors from lists.")
+    if not all(isinstance(element, float) for element in elements.elements):
+        raise LoxNativeError("Vector elements must be numbers.")
+    return LoxVec(numpy.array(elements.elements, dtype=numpy.float64))
+
+
+def _dot(left: LoxObject, right: LoxObject) -> float:
+    left_array = _expect_vec(left, "take the dot product of").array
+    right_array = _expect_vec(right, "take the dot product of").array
+    if len(left_array) != len(right_array):
+        raise LoxNativeError("Vectors must have the same length.")
+    return float(_numpy().dot(left_array, right_array))
+
+
+if VECTORS_AVAILABLE:
+    native("vec", 1)(_vec)
+    native("dot", 2)(_dot)
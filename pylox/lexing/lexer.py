@@ -1,3 +1,4 @@
+import sys
 from typing import List, Optional, Tuple, Union
 
 from pylox.utilities.error import LoxErrorHandler, LoxSyntaxError
@@ -29,6 +30,8 @@ class Lexer:
         self._sv = StreamView(source)
         self._error_handler = error_handler
         self._debug_flags = debug_flags
+        # For each interpolated expression being lexed, the number of braces opened within it.
+        self._interpolations: List[int] = list()
 
     def lex_tokens(self) -> List[Token]:
         """Scan all tokens in the source stream."""
@@ -55,12 +58,19 @@ class Lexer:
         if (doublet := char + str(self._sv.peek())) in COMPOUND_TOKENS:  # pylint: disable=superfluous-parens
             next_token = Tk(doublet)
             self._sv.advance()
+        elif char == "}" and self._interpolations and self._interpolations[-1] == 0:
+            self._interpolations.pop()  # The end of an interpolated expression: resume the template string.
+            next_token = self._template(opening=False)
         elif char in SINGLE_CHAR_TOKENS:
             next_token = Tk(char)
+            if self._interpolations and char in "{}":
+                self._interpolations[-1] += 1 if char == "{" else -1
         elif char == "/":
             next_token = self._slash()
         elif char == '"':
             next_token = self._string()
+        elif char == "`":
+            next_token = self._template(opening=True)
         elif char.isspace():  # Whitespaces are dropped.
             pass
         elif is_arabic_numeral(char):
@@ -84,6 +94,8 @@ class Lexer:
         else:
             lexeme = self._sv.get_slice_from_marker()
             offset = self._sv.current_index
+            if token_type is Tk.IDENTIFIER:  # Names are used as keys of fields and methods.
+                lexeme = sys.intern(lexeme)
         self._tokens.append(Token(token_type, lexeme, literal, offset))
 
     # ~~~ Helpers for specific token types ~~~
@@ -111,9 +123,31 @@ class Lexer:
             return None
         # Consume the closing double quotation mark.
         self._sv.advance()
-        # Return the type and the the enclosed text, stripping the quotation marks.
+        # Return the type and the the enclosed text, stripping the quotation marks. The text is interned,
+        # so that identical literals share one string, and comparing them takes a mere identity check.
         assert self._sv.marker_index is not None
-        return Tk.STRING, self._sv[self._sv.marker_index + 1:self._sv.current_index - 1]
+        return Tk.STRING, sys.intern(self._sv[self._sv.marker_index + 1:self._sv.current_index - 1])
+
+    def _template(self, *, opening: bool) -> Optional[Tuple[Tk, str]]:
+        """Consume the text of a template string up to the next interpolated expression or its end.
+
+        A template string without interpolated expressions is an ordinary string."""
+        start = self._sv.current_index
+        while self._sv.peek() not in ("`", "{") and self._sv.has_next():
+            self._sv.advance()
+        if not self._sv.has_next():
+            assert self._sv.marker_index is not None
+            self._error_handler.err(LoxSyntaxError(
+                self._sv.current_index,
+                "Unterminated string.",
+                length=self._sv.current_index - self._sv.marker_index
+            ))
+            return None
+        text = sys.intern(self._sv[start:self._sv.current_index])
+        if self._sv.advance() == "{":
+            self._interpolations.append(0)
+            return Tk.INTERPOLATION, text
+        return (Tk.STRING if opening else Tk.INTERPOLATION_END), text
 
     def _number(self) -> Tuple[Tk, float]:
         """Consume an entire number."""
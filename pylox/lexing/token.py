@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
 from enum import Enum, auto
 from typing import Any, Iterator, Optional
 
@@ -11,6 +10,8 @@ class Tk(Enum):
     # Single-char:
     BRACE_LEFT = "{"
     BRACE_RIGHT = "}"
+    BRACKET_LEFT = "["
+    BRACKET_RIGHT = "]"
     COLON = ":"
     COMMA = ","
     DOT = "."
@@ -23,6 +24,7 @@ class Tk(Enum):
     # Compoundable:
     BANG = "!"
     BANG_EQUAL = "!="
+    DOT_DOT = ".."
     EQUAL = "="
     EQUAL_EQUAL = "=="
     EQUAL_GREATER = "=>"
@@ -41,6 +43,7 @@ class Tk(Enum):
     FUN = "@FUN"
     FOR = "@FOR"
     IF = "@IF"
+    IN = "@IN"
     NIL = "@NIL"
     OR = "@OR"
     PRINT = "@PRINT"
@@ -56,6 +59,9 @@ class Tk(Enum):
     IDENTIFIER = auto()
     NUMBER = auto()
     STRING = auto()
+    # Template strings, lexed as text alternating with the tokens of the interpolated expressions:
+    INTERPOLATION = auto()  # Text followed by an interpolated expression.
+    INTERPOLATION_END = auto()  # Text closing a template string.
 
     @classmethod
     def iter_values(cls) -> Iterator[Any]:
@@ -64,26 +70,22 @@ class Tk(Enum):
             yield variant.value
 
 
-# auto() variants have integer values. Filter the remaining values by length to isolate the target ones.
-# THIS IS FRAGILE CODE: addition single-character keywords or three-character symbols will break this.
-SINGLE_CHAR_TOKENS = tuple(filter(
-    lambda val: isinstance(val, str) and len(val) == 1,
-    Tk.iter_values()
-))
-COMPOUND_TOKENS = tuple(filter(
-    lambda val: isinstance(val, str) and len(val) == 2,
-    Tk.iter_values()
-))
+# Precomputed rather than derived by iterating `Tk` so that importing the lexer stays cheap.
+# These must be kept in sync with the single-character and two-character symbols above.
+SINGLE_CHAR_TOKENS = ("{", "}", "[", "]", ":", ",", ".", "-", "(", ")", "+", "?", ";", "!", "=", ">", "<", "*")
+COMPOUND_TOKENS = ("!=", "..", "==", "=>", ">=", "<=", "**")
 
 
-@dataclass
 class Token:
     """A representation of a token. Note that offset is counted as the number of characters
     between the start of the source code and the end of the token's lexeme."""
-    token_type: Tk
-    lexeme: str
-    literal: Optional[LoxLiteral]
-    offset: int
+    __slots__ = ("token_type", "lexeme", "literal", "offset")
+
+    def __init__(self, token_type: Tk, lexeme: str, literal: Optional[LoxLiteral], offset: int) -> None:
+        self.token_type = token_type
+        self.lexeme = lexeme
+        self.literal = literal
+        self.offset = offset
 
     @classmethod
     def create_arbitrary(cls, token_type: Tk, lexeme: str, literal: Optional[LoxLiteral] = None) -> Token:
@@ -98,6 +100,11 @@ class Token:
             return self.token_type is other
         return super().__eq__(other)
 
+    __hash__ = None  # type: ignore  # Mutable and compared by identity, like the original dataclass.
+
+    def __repr__(self) -> str:
+        return f"Token({self.token_type!r}, {self.lexeme!r}, {self.literal!r}, {self.offset!r})"
+
     def __str__(self) -> str:
         attributes = ", ".join(
             f"{name}={repr(getattr(self, name))}"
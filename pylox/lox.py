@@ -1,23 +1,132 @@
+from __future__ import annotations
+
 import sys
+from contextlib import nullcontext
+from io import StringIO
+from typing import TYPE_CHECKING, ContextManager, Iterable, Iterator, List, Optional
 
 from pylox.lexing.lexer import Lexer
+from pylox.lexing.token import Tk, Token
 from pylox.parsing.parser import Parser
+from pylox.parsing.stmt import Stmt
 from pylox.runtime.interpreter import Interpreter
+from pylox.runtime.output import OutputSink
+from pylox.runtime.resolver import Resolver
+from pylox.runtime.vectorizer import vectorize_loops
+from pylox.utilities import dump_internal
 from pylox.utilities.configuration import Debug
-from pylox.utilities.error import LoxErrorHandler, LoxExit, catch_internal_error
+from pylox.utilities.error import LoxCompileError, LoxError, LoxErrorHandler, LoxExit, catch_internal_error
+
+# Debug-only and embedding-only modules are imported on first use to keep startup lean.
+# pylint: disable=import-outside-toplevel
+if TYPE_CHECKING:
+    from pylox.program import Program
+    from pylox.runtime.allocation_profiler import AllocationSnapshot
+    from pylox.runtime.coverage import CoverageReport, LineCoverage
+    from pylox.snapshot import Snapshot
+    from pylox.utilities.timings import PhaseTiming, RunTimings
 
 
 class Lox:
     PROMPT_CHARACTER = ">>> "
 
-    def __init__(self, debug_flags: Debug = Debug(0)) -> None:
+    def __init__(self, debug_flags: Debug = Debug(0), *, output: Optional[OutputSink] = None) -> None:
+        """Create an interpreter session.
+
+        :param debug_flags: debugging options, defaults to Debug(0)
+        :type debug_flags: Debug, optional
+        :param output: where `print` statements write, defaults to a buffered sink on stdout
+        :type output: Optional[OutputSink], optional
+        """
         self.debug_flags = debug_flags
         self.error_handler = LoxErrorHandler(self.debug_flags)
-        self.interpreter = Interpreter(self.error_handler, dump=bool(self.debug_flags & Debug.DUMP_AST))
+        interpreter_type = Interpreter
+        if self.debug_flags & Debug.ALLOCATIONS:
+            from pylox.runtime.allocation_profiler import ProfilingInterpreter
+            interpreter_type = ProfilingInterpreter
+        self.interpreter = interpreter_type(
+            self.error_handler, dump=bool(self.debug_flags & Debug.DUMP_AST), output=output
+        )
+        # Per-phase breakdown of the most recent run, populated when `Debug.TIMINGS` is set.
+        self.last_timings: Optional[RunTimings] = None
+        self.coverage: Optional[LineCoverage] = None
+
+    def enable_coverage(self) -> None:
+        """Count executions of each source line in subsequent runs. See `coverage_report()`."""
+        if self.coverage is None:
+            from pylox.runtime.coverage import LineCoverage
+            self.coverage = LineCoverage()
+            self.interpreter.attach_hook(self.coverage)
+
+    def coverage_report(self) -> CoverageReport:
+        """Report the line coverage of the most recent run."""
+        if self.coverage is None:
+            raise RuntimeError("Coverage has not been enabled.")
+        return self.coverage.report(self.error_handler)
+
+    def allocation_snapshot(self, label: str = "snapshot") -> "AllocationSnapshot":
+        """Report live Lox objects by allocation site. Requires `Debug.ALLOCATIONS`."""
+        from pylox.runtime.allocation_profiler import ProfilingInterpreter
+        if not isinstance(self.interpreter, ProfilingInterpreter):
+            raise RuntimeError("Allocation profiling has not been enabled.")
+        return self.interpreter.allocation_snapshot(label)
+
+    def snapshot(self) -> Snapshot:
+        """Capture the globals defined by the programs run so far, e.g. by a prelude of library code.
+
+        :raises ValueError: if a global holds a value bound to the running process, such as a file
+        """
+        return self.interpreter.snapshot()
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """Start subsequent runs from the globals of a snapshot instead of an empty environment."""
+        self.interpreter.restore(snapshot)
 
-    def run_file(self, path: str) -> None:
+    def compile(
+            self,
+            source: str,
+            *,
+            predeclared: Iterable[str] = (),
+            snapshot: Optional[Snapshot] = None
+    ) -> Program:
+        """Lex, parse and resolve a program once, so that it can be run many times with `Program.run()`.
+
+        :param source: source string
+        :type source: str
+        :param predeclared: names of globals that the program reads without declaring them,
+            to be supplied as bindings to each run, defaults to ()
+        :type predeclared: Iterable[str], optional
+        :param snapshot: prelude whose globals the program may use; each run starts from a fresh copy
+            of the snapshot's environment, defaults to None
+        :type snapshot: Optional[Snapshot], optional
+        :raises LoxCompileError: if the source contains syntax errors
+        :rtype: Program
+        """
+        from pylox.program import Program
+        source = source.replace("\r\n", "\n")
+        errors = StringIO()
+        error_handler = LoxErrorHandler(self.debug_flags, stream=errors)
+        error_handler.set_source(source)
+        predeclared_idents = tuple(Token.create_arbitrary(Tk.IDENTIFIER, name) for name in predeclared)
+        resolver = Resolver()
+        try:
+            tokens = Lexer(source, error_handler, debug_flags=self.debug_flags).lex_tokens()
+            error_handler.checkpoint()
+            statements = Parser(tokens, error_handler).parse()
+            error_handler.checkpoint()
+            try:
+                resolver.resolve(statements, predeclared_idents, snapshot.global_ids if snapshot else None)
+                vectorize_loops(statements)
+            except LoxError as error:
+                error_handler.err(error)
+            error_handler.checkpoint()
+        except LoxExit:
+            raise LoxCompileError(errors.getvalue()) from None
+        return Program(source, tuple(statements), resolver.global_names, self.debug_flags, snapshot)
+
+    def run_file(self, path: str, *, pipelined: bool = False) -> None:
         with open(path, 'r') as fil:
-            self.run(fil.read())
+            self.run(fil.read(), pipelined=pipelined)
 
     def run_interactive(self) -> None:
         import readline  # pylint: disable=unused-import, import-outside-toplevel
@@ -29,19 +138,76 @@ class Lox:
             except (KeyboardInterrupt, EOFError):  # Exit gracefully on ctrl-c or ctrl-d.
                 sys.exit(0)
 
-    def run(self, source: str) -> None:
+    def run(self, source: str, *, pipelined: bool = False) -> None:
+        """Run a program.
+
+        :param source: source string
+        :type source: str
+        :param pipelined: parse, resolve and execute one top-level declaration at a time instead of
+            each phase over the whole program in turn. Output starts sooner and only one declaration's
+            AST is alive at once, but syntax errors are only caught when the parser reaches them,
+            possibly after earlier declarations have run. Defaults to False
+        :type pipelined: bool, optional
+        """
+        timings: Optional[RunTimings] = None
+        if self.debug_flags & Debug.TIMINGS:
+            from pylox.utilities.timings import RunTimings
+            timings = RunTimings()
+        self.last_timings = timings
+        try:
+            self._run(source, timings, pipelined)
+        finally:
+            self.interpreter.output.flush()
+            if timings is not None:
+                dump_internal("Timing", timings)
+
+    @staticmethod
+    def _phase(timings: Optional[RunTimings], name: str) -> ContextManager[Optional[PhaseTiming]]:
+        """Measure a phase if timing is enabled, otherwise do nothing."""
+        return nullcontext() if timings is None else timings.phase(name)
+
+    def _run(self, source: str, timings: Optional[RunTimings], pipelined: bool) -> None:
         with catch_internal_error(dump_backtrace=bool(self.debug_flags & Debug.BACKTRACE), ignore_types=(LoxExit,)):
             source = source.replace("\r\n", "\n")
             self.error_handler.set_source(source)
 
-            tokens = Lexer(source, self.error_handler, debug_flags=self.debug_flags).lex_tokens()
+            with self._phase(timings, "lex") as phase:
+                tokens = Lexer(source, self.error_handler, debug_flags=self.debug_flags).lex_tokens()
+            if phase is not None:
+                phase.count, phase.unit = len(tokens), "tokens"
 
             self.error_handler.checkpoint()
             if self.debug_flags & Debug.NO_PARSE:
                 raise LoxExit(0)
-            statements = Parser(tokens, self.error_handler).parse()
+            if pipelined and not self.debug_flags & Debug.NO_INTERPRET:
+                with self._phase(timings, "pipeline"):
+                    self._run_pipelined(source, tokens)
+                return
+            with self._phase(timings, "parse") as phase:
+                statements = Parser(tokens, self.error_handler).parse()
+            if phase is not None:
+                from pylox.parsing.walk import walk
+                phase.count, phase.unit = sum(1 for _ in walk(statements)), "nodes"
 
             self.error_handler.checkpoint()
             if self.debug_flags & Debug.NO_INTERPRET:
                 raise LoxExit(0)
-            self.interpreter.interpret(statements)
+            with self._phase(timings, "resolve"):
+                self.interpreter.resolve(statements)
+            self.error_handler.checkpoint()
+            if self.coverage is not None:
+                self.coverage.begin(source, statements)
+            with self._phase(timings, "execute"):
+                self.interpreter.execute(statements)
+
+    def _run_pipelined(self, source: str, tokens: List[Token]) -> None:
+        def declarations() -> Iterator[Stmt]:
+            for declaration in Parser(tokens, self.error_handler).parse_incrementally():
+                if self.coverage is not None:
+                    self.coverage.register([declaration])
+                yield declaration
+
+        if self.coverage is not None:
+            self.coverage.begin(source, [])
+        self.interpreter.interpret_incrementally(declarations())
+        self.error_handler.checkpoint()
@@ -1,13 +1,14 @@
-from dataclasses import dataclass
 from typing import TYPE_CHECKING, List, Optional
 
 from pylox.language.lox_types import FunctionKind, LoxIdentifier, LoxPrimitive, lox_object_to_repr
 from pylox.lexing.token import Token
-from pylox.utilities import ast_node_pretty_printer
+from pylox.utilities import ast_node_pretty_printer, ast_node_repr
 
 if TYPE_CHECKING:
     from pylox.parsing.stmt import GroupingDirective
 
+# Nodes are plain classes rather than dataclasses: generating dataclasses dominated pylox's import time.
+
 
 class Expr:
     """Base class for expressions which have differing attributes."""
@@ -16,97 +17,134 @@ class Expr:
         name, values = ast_node_pretty_printer(self, "Expr")
         return f"({name} {' '.join(values)})"
 
+    def __repr__(self) -> str:
+        return ast_node_repr(self)
+
 
-@dataclass
 class AnonymousFunctionExpr(Expr):
-    params: List["VariableExpr"]
-    body: "GroupingDirective"
-    kind: FunctionKind
+    def __init__(self, params: List["VariableExpr"], body: "GroupingDirective", kind: FunctionKind) -> None:
+        self.params = params
+        self.body = body
+        self.kind = kind
 
     def __str__(self) -> str:
         params_text = ", ".join(param.target.lexeme for param in self.params)
         return f"(anonymousfunction [{params_text}], {self.body})"
 
 
-@dataclass
 class AssignmentExpr(Expr):
-    target: Token
-    value: Expr
-    target_id: Optional[LoxIdentifier] = None
+    def __init__(self, target: Token, value: Expr, target_id: Optional[LoxIdentifier] = None) -> None:
+        self.target = target
+        self.value = value
+        self.target_id = target_id
 
 
-@dataclass
 class DynamicAssignmentExpr(Expr):
-    target: "AttributeAccessExpr"
-    value: Expr
+    def __init__(self, target: "AttributeAccessExpr", value: Expr) -> None:
+        self.target = target
+        self.value = value
 
 
-@dataclass
 class AttributeAccessExpr(Expr):
-    target: Expr
-    attribute: Token
+    def __init__(self, target: Expr, attribute: Token) -> None:
+        self.target = target
+        self.attribute = attribute
 
 
-@dataclass
 class BinaryExpr(Expr):
-    operator: Token
-    left: Expr
-    right: Expr
+    def __init__(self, operator: Token, left: Expr, right: Expr) -> None:
+        self.operator = operator
+        self.left = left
+        self.right = right
 
     def __str__(self) -> str:
         return f"({self.operator.lexeme} {self.left} {self.right})"
 
 
-@dataclass
 class LogicalExpr(BinaryExpr):
     pass
 
 
-@dataclass
 class CallExpr(Expr):
-    callee: Expr
-    paren: Token
-    arguments: List[Expr]
+    def __init__(self, callee: Expr, paren: Token, arguments: List[Expr]) -> None:
+        self.callee = callee
+        self.paren = paren
+        self.arguments = arguments
 
     def __str__(self) -> str:
         return f"(call {self.callee} [{', '.join(map(str, self.arguments))}])"
 
 
-@dataclass
 class GroupingExpr(Expr):
-    expression: Expr
+    def __init__(self, expression: Expr) -> None:
+        self.expression = expression
+
+
+class IndexExpr(Expr):
+    def __init__(self, target: Expr, bracket: Token, index: Expr) -> None:
+        self.target = target
+        self.bracket = bracket
+        self.index = index
+
+    def __str__(self) -> str:
+        return f"(index {self.target} {self.index})"
+
+
+class IndexAssignmentExpr(Expr):
+    def __init__(self, target: IndexExpr, value: Expr) -> None:
+        self.target = target
+        self.value = value
+
+
+class InterpolationExpr(Expr):
+    """A template string: the strings of its parts, concatenated."""
+
+    def __init__(self, parts: List[Expr]) -> None:
+        self.parts = parts
+
+    def __str__(self) -> str:
+        return f"(interpolation [{', '.join(map(str, self.parts))}])"
+
+
+class ListExpr(Expr):
+    def __init__(self, bracket: Token, elements: List[Expr]) -> None:
+        self.bracket = bracket
+        self.elements = elements
+
+    def __str__(self) -> str:
+        return f"(list [{', '.join(map(str, self.elements))}])"
 
 
-@dataclass
 class LiteralExpr(Expr):
-    value: LoxPrimitive
+    def __init__(self, value: LoxPrimitive) -> None:
+        self.value = value
 
     def __str__(self) -> str:
         return lox_object_to_repr(self.value)
 
 
-@dataclass
 class TernaryIfExpr(Expr):
-    condition: Expr
-    then_branch: Expr
-    else_branch: Expr
+    def __init__(self, condition: Expr, then_branch: Expr, else_branch: Expr) -> None:
+        self.condition = condition
+        self.then_branch = then_branch
+        self.else_branch = else_branch
 
 
-@dataclass
 class ThisExpr(Expr):
-    keyword: Token
+    def __init__(self, keyword: Token) -> None:
+        self.keyword = keyword
 
 
-@dataclass
 class UnaryExpr(Expr):
-    operator: Token
-    right: Expr
+    def __init__(self, operator: Token, right: Expr) -> None:
+        self.operator = operator
+        self.right = right
 
     def __str__(self) -> str:
         return f"({self.operator.lexeme} {self.right})"
 
 
-@dataclass
 class VariableExpr(Expr):
-    target: Token
-    target_id: Optional[LoxIdentifier] = None
+    def __init__(self, target: Token, target_id: Optional[LoxIdentifier] = None) -> None:
+        self.target = target
+        self.target_id = target_id
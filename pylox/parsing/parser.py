@@ -56,6 +56,7 @@ OPERATOR_PRECEDENCE = {
     Tk.STAR_STAR: Prec.EXP,
     Tk.DOT: Prec.CALL,
     Tk.PAREN_LEFT: Prec.CALL,
+    Tk.BRACKET_LEFT: Prec.CALL,
 }
 
 
@@ -73,10 +74,16 @@ class Parser:
         self._ast: List[Stmt] = list()
 
     def parse(self) -> List[Stmt]:
+        self._ast.extend(self.parse_incrementally())
+        return self._ast
+
+    def parse_incrementally(self) -> Iterator[Stmt]:
+        """*Lazily* parse the token stream, yielding each top-level declaration as soon as it is complete.
+
+        Syntax errors are reported to the error handler as they are found, and erroneous declarations are skipped."""
         while self._has_next():
             if declaration := self._declaration():
-                self._ast.append(declaration)
-        return self._ast
+                yield declaration
 
     # ~~~ Helper functions ~~~
 
@@ -162,6 +169,7 @@ class Parser:
 
     def _declaration(self) -> Optional[Stmt]:
         decl: Optional[Stmt]
+        start = self._tv.peek_unwrap()
         try:
             if self._tv.advance_if_match(Tk.VAR):
                 decl = self._variable_declaration_parselet()
@@ -177,6 +185,8 @@ class Parser:
             self._synchronize()
             decl = None
 
+        if decl is not None:
+            decl.offset = start.offset
         return decl
 
     def _class_declaration_parselet(self) -> ClassDeclarationStmt:
@@ -216,6 +226,7 @@ class Parser:
     def _statement(self) -> Stmt:
         # When is Python 3.10 coming out again???
         stmt: Stmt
+        start = self._tv.peek_unwrap()
         if self._tv.advance_if_match(Tk.FOR):
             stmt = self._for_statement_parselet()
         elif self._tv.advance_if_match(Tk.IF):
@@ -233,14 +244,32 @@ class Parser:
             stmt = self._while_statement_parselet()
         else:
             stmt = self._expression_statement_parselet()
+        stmt.offset = start.offset
         return stmt
 
     def _expression_statement_parselet(self) -> ExpressionStmt:
         """Production: `EXPR ";" ;`"""
-        stmt = ExpressionStmt(self._expression())
+        expression = self._expression()
+        stmt = AppendStmt(expression) if self._is_append(expression) else ExpressionStmt(expression)
         self._expect_punct(Tk.SEMICOLON, "after expression")
         return stmt
 
+    @staticmethod
+    def _is_append(expression: Expr) -> bool:
+        """Recognize `variable = variable + a + b ...`, where the first addend is not a number literal
+        (ruling out counters such as `i = i + 1`, which are never strings)."""
+        if not isinstance(expression, AssignmentExpr):
+            return False
+        value = expression.value
+        while type(value) is BinaryExpr and value.operator.token_type is Tk.PLUS:
+            if isinstance(value.left, VariableExpr):
+                return (
+                    value.left.target.lexeme == expression.target.lexeme
+                    and not (isinstance(value.right, LiteralExpr) and isinstance(value.right.value, float))
+                )
+            value = value.left
+        return False
+
     def _for_statement_parselet(self) -> Stmt:
         """Parse C-style for loops by desugaring them into while loops.
 
@@ -268,8 +297,13 @@ class Parser:
 
         Production: `"for" "(" ( VAR_STMT | EXPR )? ";" EXPR? ";" EXPR? ")" STMT ;`
         ```
+
+        For-each loops, `for (i in 0..10)`, are handed over to `_for_each_statement_parselet()`.
         """
+        keyword = self._tv.peek_unwrap(-1)
         self._expect_punct(Tk.PAREN_LEFT, "after 'for'")
+        if self._tv.peek() == Tk.IDENTIFIER and self._tv.peek(1) == Tk.IN:
+            return self._for_each_statement_parselet()
 
         initializer: Optional[Stmt]
         if self._tv.advance_if_match(Tk.SEMICOLON):
@@ -288,13 +322,28 @@ class Parser:
         body = self._statement()
 
         if increment:
-            body = GroupingDirective(body, ExpressionStmt(increment))
+            increment_stmt = ExpressionStmt(increment)
+            increment_stmt.offset = keyword.offset  # Attribute each iteration to the loop header.
+            body = GroupingDirective(body, increment_stmt)
         body = WhileStmt(condition, BlockStmt(body))
         if initializer:
             body = BlockStmt(initializer, body)
 
         return body
 
+    def _for_each_statement_parselet(self) -> ForEachStmt:
+        """Parse a for-each loop, once past its opening parenthesis. Unlike C-style for loops, it is
+        not desugared: the loop variable is declared in a scope of its own, which is entered only once.
+
+        Production: `"for" "(" IDENTIFIER "in" EXPR ( ".." EXPR )? ")" STMT ;`
+        """
+        ident = self._tv.advance()
+        keyword = self._tv.advance()
+        iterable = self._expression()
+        end = self._expression() if self._tv.advance_if_match(Tk.DOT_DOT) else None
+        self._expect_punct(Tk.PAREN_RIGHT, "after for-each clauses")
+        return ForEachStmt(ident, keyword, iterable, end, self._statement())
+
     def _if_statement_parselet(self) -> IfStmt:
         """Note that branches are scoped. That is, variables instantiated inside
         the if statement do not get added to the parent scope. This is to ensure
@@ -425,6 +474,14 @@ class Parser:
                 Tk.TRUE: True,
                 Tk.NIL: None
             }.get(token_type, token.literal))
+        elif token_type is Tk.BRACKET_LEFT:
+            left = ListExpr(token, list(self._parse_repeatedly(
+                self._expression,
+                terminator=Tk.BRACKET_RIGHT,
+                terminator_expect_message="after list elements"
+            )))
+        elif token_type is Tk.INTERPOLATION:
+            left = self._interpolation_expression_parselet(token)
         elif token_type is Tk.FUN:
             left = self._anonymous_function_expression_parselet(FunctionKind.FUNCTION)
         elif token_type is Tk.IDENTIFIER:
@@ -456,7 +513,7 @@ class Parser:
                     self._expect_punct(Tk.COLON, "in ternary if operator")
 
                 # Postfix operators do not have an RHS expression.
-                if op_type not in {Tk.DOT, Tk.PAREN_LEFT}:
+                if op_type not in {Tk.DOT, Tk.PAREN_LEFT, Tk.BRACKET_LEFT}:
                     # Otherwise, parse the RHS up to the current operator's precedence,
                     # taking right associativity into account, if necessary.
                     right = self._expression(prec.adjust_for_operator_associativity(op_type))
@@ -470,6 +527,9 @@ class Parser:
                     left = self._assignment_expression_parselet(op, left, right)
                 elif op_type is Tk.PAREN_LEFT:
                     left = CallExpr(left, op, list(self._parse_repeatedly(self._expression)))
+                elif op_type is Tk.BRACKET_LEFT:
+                    left = IndexExpr(left, op, self._expression())
+                    self._expect_punct(Tk.BRACKET_RIGHT, "after index")
                 elif op_type is Tk.QUESTION:
                     left = TernaryIfExpr(left, middle, right)
                 else:
@@ -518,13 +578,32 @@ class Parser:
             op: Token,
             left: Expr,
             right: Expr
-    ) -> Union[AssignmentExpr, DynamicAssignmentExpr]:
+    ) -> Union[AssignmentExpr, DynamicAssignmentExpr, IndexAssignmentExpr]:
         if isinstance(left, VariableExpr):
             return AssignmentExpr(left.target, right)
         if isinstance(left, AttributeAccessExpr):
             return DynamicAssignmentExpr(left, right)
+        if isinstance(left, IndexExpr):
+            return IndexAssignmentExpr(left, right)
         raise LoxSyntaxError.at_token(op, "Invalid assignment target.")
 
+    def _interpolation_expression_parselet(self, token: Token) -> InterpolationExpr:
+        """Parse a template string, which the lexer splits into text tokens, each but the last of
+        which is followed by the tokens of an interpolated expression.
+
+        Production: `INTERPOLATION EXPR ( INTERPOLATION EXPR )* INTERPOLATION_END ;`
+        """
+        parts: List[Expr] = list()
+        while True:
+            if token.literal:
+                parts.append(LiteralExpr(token.literal))
+            if token.token_type is Tk.INTERPOLATION_END:
+                return InterpolationExpr(parts)
+            parts.append(self._expression())
+            if not self._tv.match(Tk.INTERPOLATION, Tk.INTERPOLATION_END):
+                raise LoxSyntaxError.at_token(self._tv.peek_unwrap(), "Expect '}' after interpolated expression.")
+            token = self._tv.advance()
+
     def _attribute_access_expression_parselet(self, left: Expr) -> AttributeAccessExpr:
         attr_name = self._expect_next(Tk.IDENTIFIER, "Expect property name after '.'.")
         return AttributeAccessExpr(left, attr_name)
@@ -1,19 +1,28 @@
-from dataclasses import dataclass
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
 from pylox.language.lox_types import LoxIdentifier
 from pylox.lexing.token import Token
-from pylox.parsing.expr import Expr
-from pylox.utilities import ast_node_pretty_printer, indent
+from pylox.parsing.expr import AssignmentExpr, Expr
+from pylox.utilities import ast_node_pretty_printer, ast_node_repr, indent
+
+if TYPE_CHECKING:
+    from pylox.runtime.vectorizer import LoopKernel
 
 
 class Stmt:
-    """Base class for Lox statements."""
+    """Base class for Lox statements.
+
+    `offset` locates the first token of a statement that appears in the source, using the
+    same convention as `Token.offset`. Statements synthesized by the parser keep the default of -1."""
+    offset: int = -1
 
     def __str__(self) -> str:
         name, values = ast_node_pretty_printer(self, "Stmt")
         return f"<{name}: {', '.join(values)}>"
 
+    def __repr__(self) -> str:
+        return ast_node_repr(self)
+
 
 class GroupingDirective(Stmt):
     """An un-scoped group of statements."""
@@ -38,52 +47,102 @@ class BlockStmt(GroupingDirective):
         else:
             super().__init__(*body)
 
-@dataclass
+
 class ClassDeclarationStmt(Stmt):
-    name: Token
-    instance_variables: List["VariableDeclarationStmt"]
-    uniq_id: Optional[LoxIdentifier] = None
+    def __init__(
+            self,
+            name: Token,
+            instance_variables: List["VariableDeclarationStmt"],
+            uniq_id: Optional[LoxIdentifier] = None
+    ) -> None:
+        self.name = name
+        self.instance_variables = instance_variables
+        self.uniq_id = uniq_id
 
     def __str__(self) -> str:
         body_text = "".join(indent(str(stmt)) for stmt in self.instance_variables)
         return f"<{type(self).__name__.lower().replace('stmt', '')}: {self.name}\n{indent(body_text)}\n{self.uniq_id}>"
 
 
-@dataclass
 class ExpressionStmt(Stmt):
-    expression: Expr
+    def __init__(self, expression: Expr) -> None:
+        self.expression = expression
+
+
+class AppendStmt(ExpressionStmt):
+    """An expression statement of the form `variable = variable + a + b ...;`.
+
+    When the variable holds a string, it may be extended with a `StringBuilder` rather than
+    concatenated anew, so that building up a string one piece at a time is not quadratic."""
+    expression: AssignmentExpr
 
 
-@dataclass
 class IfStmt(Stmt):
-    condition: Expr
-    then_branch: Stmt
-    else_branch: Optional[Stmt]
+    def __init__(self, condition: Expr, then_branch: Stmt, else_branch: Optional[Stmt]) -> None:
+        self.condition = condition
+        self.then_branch = then_branch
+        self.else_branch = else_branch
 
     def __str__(self) -> str:
-        inner_text = "".join(indent(str(attr)) for attr in vars(self).values())
+        inner_text = "".join(indent(str(attr)) for attr in (self.condition, self.then_branch, self.else_branch))
         return f"<if:\n{inner_text}>"
 
 
-@dataclass
 class PrintStmt(Stmt):
-    expression: Expr
+    def __init__(self, expression: Expr) -> None:
+        self.expression = expression
 
 
-@dataclass
 class ReturnStmt(Stmt):
-    keyword: Token
-    expression: Optional[Expr]
+    def __init__(self, keyword: Token, expression: Optional[Expr]) -> None:
+        self.keyword = keyword
+        self.expression = expression
 
 
-@dataclass
 class VariableDeclarationStmt(Stmt):
-    ident: Token
-    initializer: Optional[Expr]
-    uniq_id: Optional[LoxIdentifier] = None
+    def __init__(self, ident: Token, initializer: Optional[Expr], uniq_id: Optional[LoxIdentifier] = None) -> None:
+        self.ident = ident
+        self.initializer = initializer
+        self.uniq_id = uniq_id
 
 
-@dataclass
 class WhileStmt(Stmt):
-    condition: Expr
-    body: Stmt
+    def __init__(self, condition: Expr, body: Stmt) -> None:
+        self.condition = condition
+        self.body = body
+
+
+class ForEachStmt(Stmt):
+    """A loop binding a variable to each element of a sequence, or to each integer of the range
+    `iterable..end` (excluding `end`) if `end` is given."""
+
+    def __init__(
+            self,
+            ident: Token,
+            keyword: Token,
+            iterable: Expr,
+            end: Optional[Expr],
+            body: Stmt,
+            uniq_id: Optional[LoxIdentifier] = None
+    ) -> None:
+        self.ident = ident
+        self.keyword = keyword
+        self.iterable = iterable
+        self.end = end
+        self.body = body
+        self.uniq_id = uniq_id
+
+
+class VectorizedLoopStmt(Stmt):
+    """A loop that `pylox.runtime.vectorizer` recognized as elementwise arithmetic over lists.
+
+    The `kernel` executes the whole loop in bulk; the original `loop` is executed instead whenever
+    the kernel cannot prove, at run time, that doing so is equivalent."""
+
+    def __init__(self, loop: BlockStmt, kernel: "LoopKernel") -> None:
+        self.loop = loop
+        self.kernel = kernel
+        self.offset = loop.offset
+
+    def __str__(self) -> str:
+        return f"<vectorized:\n{indent(str(self.loop))}>"
@@ -0,0 +1,26 @@
+from typing import Iterable, Iterator, List, Union
+
+from pylox.parsing.expr import Expr
+from pylox.parsing.stmt import Stmt
+
+Node = Union[Expr, Stmt]
+
+
+def iter_child_nodes(node: Node) -> Iterator[Node]:
+    """Yield the direct children of an AST node, in declaration order."""
+    for attr in vars(node).values():
+        if isinstance(attr, (Expr, Stmt)):
+            yield attr
+        elif isinstance(attr, list):
+            yield from (item for item in attr if isinstance(item, (Expr, Stmt)))
+
+
+def walk(nodes: Iterable[Node]) -> Iterator[Node]:
+    """Yield every node of an AST in depth-first pre-order.
+
+    The traversal is iterative so that deeply nested programs do not exhaust the recursion limit."""
+    stack: List[Node] = list(nodes)[::-1]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(tuple(iter_child_nodes(node))))
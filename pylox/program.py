@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from io import StringIO
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, Iterator, Mapping, Optional, Sequence, Tuple
+
+from pylox.language.lox_types import LoxIdentifier, LoxObject
+from pylox.parsing.stmt import Stmt
+from pylox.runtime.hooks import InterpreterHook
+from pylox.runtime.interpreter import Interpreter
+from pylox.runtime.output import MemorySink
+from pylox.utilities.configuration import Debug
+from pylox.utilities.error import LoxErrorHandler, LoxExit
+
+if TYPE_CHECKING:
+    from pylox.snapshot import Snapshot
+
+
+@dataclass(frozen=True)
+class RunResult:
+    output: str  # Everything printed by the program.
+    errors: str  # Error reports, formatted as they would have been written to stderr.
+    exit_code: int
+    globals: Mapping[str, LoxObject]  # Final values of the program's global variables.
+
+    @property
+    def ok(self) -> bool:
+        return self.exit_code == 0
+
+
+class _FinalGlobals(Mapping[str, LoxObject]):
+    """The final globals of a run, looked up in the interpreter's environment on access.
+
+    Eagerly copying every global out would touch (and thus, in a forked worker, un-share) the
+    names and identifiers of all of a program's globals, even if the caller never reads one."""
+
+    def __init__(self, global_ids: Mapping[str, LoxIdentifier], interpreter: Interpreter) -> None:
+        self._global_ids = global_ids
+        self._interpreter = interpreter
+
+    def __getitem__(self, name: str) -> LoxObject:
+        return self._interpreter.get_global(self._global_ids[name])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._global_ids)
+
+    def __len__(self) -> int:
+        return len(self._global_ids)
+
+
+class Program:
+    """A lexed, parsed and resolved Lox program, as produced by `Lox.compile()`.
+
+    A program is never modified after compilation, so the same instance can be run
+    any number of times. Each run executes on a fresh interpreter and environment,
+    and nothing a run writes is shared with other runs, so that runs may proceed
+    concurrently in several threads."""
+
+    def __init__(
+            self,
+            source: str,
+            statements: Tuple[Stmt, ...],
+            global_ids: Dict[str, LoxIdentifier],
+            debug_flags: Debug = Debug(0),
+            snapshot: Optional[Snapshot] = None
+    ) -> None:
+        self._source = source
+        self._statements = statements
+        self._global_ids = MappingProxyType(global_ids)
+        self._debug_flags = debug_flags
+        self._snapshot = snapshot
+
+    @property
+    def source(self) -> str:
+        return self._source
+
+    @property
+    def statements(self) -> Tuple[Stmt, ...]:
+        return self._statements
+
+    @property
+    def global_ids(self) -> Mapping[str, LoxIdentifier]:
+        """The globals declared by the program (including predeclared ones), by name."""
+        return self._global_ids
+
+    def run(
+            self,
+            bindings: Optional[Mapping[str, LoxObject]] = None,
+            *,
+            hooks: Sequence[InterpreterHook] = ()
+    ) -> RunResult:
+        """Execute the program, capturing its output and errors.
+
+        :param bindings: initial values of global variables, defaults to None
+        :type bindings: Optional[Mapping[str, LoxObject]], optional
+        :param hooks: observers to attach to the interpreter of this run, defaults to ()
+        :type hooks: Sequence[InterpreterHook], optional
+        :raises ValueError: if a binding does not name a global of the program
+        :rtype: RunResult
+        """
+        output = MemorySink()
+        errors = StringIO()
+        error_handler = LoxErrorHandler(self._debug_flags, stream=errors)
+        error_handler.set_source(self._source)
+        interpreter = Interpreter(error_handler, output=output)
+        for hook in hooks:
+            interpreter.attach_hook(hook)
+        if self._snapshot is not None:
+            interpreter.restore(self._snapshot)
+
+        for name, value in (bindings or {}).items():
+            if name not in self._global_ids:
+                raise ValueError(f"'{name}' is not a global of this program; it must be predeclared.")
+            interpreter.define_global(self._global_ids[name], value)
+
+        exit_code = 0
+        try:
+            interpreter.execute(self._statements)
+            error_handler.checkpoint()
+        except LoxExit as exit_request:
+            exit_code = int(exit_request.code or 0)
+
+        return RunResult(output.getvalue(), errors.getvalue(), exit_code, _FinalGlobals(self._global_ids, interpreter))
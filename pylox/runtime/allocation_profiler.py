@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import gc
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, DefaultDict, Dict, Iterable, List, Optional, Set, Tuple, Union
+from weakref import WeakKeyDictionary
+
+from pylox.language.lox_callable import LoxFunction
+from pylox.language.lox_class import LoxClass, LoxInstance
+from pylox.language.lox_list import LoxList
+from pylox.language.lox_map import LoxMap
+from pylox.language.lox_types import LoxObject
+from pylox.language.lox_vec import LoxVec
+from pylox.lexing.token import Tk
+from pylox.parsing.expr import AnonymousFunctionExpr, BinaryExpr, CallExpr
+from pylox.parsing.stmt import AppendStmt, Stmt
+from pylox.runtime.interpreter import Interpreter
+from pylox.runtime.output import OutputSink
+from pylox.utilities.error import LoxErrorHandler
+
+# An allocation site is the kind of object allocated and the source line of the statement that allocated it.
+Site = Tuple[str, int]
+
+
+@dataclass
+class SiteStats:
+    kind: str
+    line: int
+    count: int
+    size: int
+
+    def __str__(self) -> str:
+        return f"{self.kind:<10}line {self.line:<6}{self.count:>8} live{self.size / 1024:>12.1f} KiB"
+
+
+@dataclass
+class AllocationSnapshot:
+    label: str
+    sites: List[SiteStats]
+
+    @property
+    def total_count(self) -> int:
+        return sum(site.count for site in self.sites)
+
+    @property
+    def total_size(self) -> int:
+        return sum(site.size for site in self.sites)
+
+    def __str__(self) -> str:
+        header = f"{self.label}: {self.total_count} live objects, {self.total_size / 1024:.1f} KiB"
+        return "\n".join((header, *map(str, self.sites)))
+
+
+class ProfilingInterpreter(Interpreter):
+    """An interpreter that attributes every `LoxInstance`, `LoxFunction` and string concatenation
+    result to the source line of the statement that allocated it.
+
+    Instances and functions are tracked through weak references, so that they are counted for as
+    long as they are alive. Strings cannot be weakly referenced; they are instead remembered by
+    identity and counted only if they are still reachable from the environment when a snapshot
+    is taken."""
+
+    def __init__(
+            self,
+            error_handler: LoxErrorHandler,
+            *,
+            dump: bool = False,
+            output: Optional[OutputSink] = None
+    ) -> None:
+        super().__init__(error_handler, dump=dump, output=output)
+        self._site_offset = -1
+        self._objects: WeakKeyDictionary[Any, Site] = WeakKeyDictionary()
+        self._strings: Dict[int, Tuple[Site, int]] = dict()  # id() to site and length.
+
+    def allocation_snapshot(self, label: str = "snapshot") -> AllocationSnapshot:
+        """Report the live objects, and the memory they occupy, grouped by allocation site."""
+        gc.collect()  # Closures routinely form reference cycles with their defining frame.
+        counts: DefaultDict[Site, int] = defaultdict(int)
+        sizes: DefaultDict[Site, int] = defaultdict(int)
+        for obj, site in list(self._objects.items()):
+            counts[site] += 1
+            sizes[site] += self._size_of(obj)
+
+        live_strings: Dict[int, Tuple[Site, int]] = dict()
+        for obj in self._reachable_objects():
+            if isinstance(obj, str) and (entry := self._strings.get(id(obj))) and entry[1] == len(obj):
+                live_strings[id(obj)] = entry
+                counts[entry[0]] += 1
+                sizes[entry[0]] += sys.getsizeof(obj)
+        self._strings = live_strings  # Forget strings that have since been released.
+
+        sites = [SiteStats(kind, line, counts[(kind, line)], sizes[(kind, line)]) for kind, line in counts]
+        sites.sort(key=lambda stats: (-stats.size, stats.line))
+        return AllocationSnapshot(label, sites)
+
+    # ~~~ Helper functions ~~~
+
+    def _site(self, kind: str) -> Site:
+        return kind, self._error_handler.line_number(self._site_offset)
+
+    def _track(self, obj: Union[LoxFunction, LoxInstance], kind: str) -> None:
+        if obj not in self._objects:  # Only the first sighting of an object is its allocation.
+            self._objects[obj] = self._site(kind)
+
+    @staticmethod
+    def _size_of(obj: Union[LoxFunction, LoxInstance]) -> int:
+        if isinstance(obj, LoxInstance):
+            return sys.getsizeof(obj) + sys.getsizeof(obj.variables)
+        return sys.getsizeof(obj) + sys.getsizeof(vars(obj)) + sys.getsizeof(obj.closure)
+
+    def _reachable_objects(self) -> Iterable[LoxObject]:
+        """Traverse the object graph rooted at the current environment."""
+        seen: Set[int] = set()
+        stack: List[Any] = list(self._environment[:])
+        while stack:
+            obj = stack.pop()
+            if id(obj) in seen:
+                continue
+            seen.add(id(obj))
+            if isinstance(obj, dict):
+                stack.extend(obj.values())
+            elif isinstance(obj, list):
+                stack.extend(obj)
+            else:
+                yield obj
+                if isinstance(obj, LoxInstance):
+                    stack.extend((obj.variables, obj._class))  # pylint: disable=protected-access
+                elif isinstance(obj, LoxClass):
+                    stack.extend((obj.variables, obj.closure))
+                elif isinstance(obj, LoxFunction):
+                    stack.extend((obj.closure, obj.bound_instance))
+                elif isinstance(obj, LoxList):
+                    stack.append(obj.elements)
+                elif isinstance(obj, LoxMap):
+                    stack.extend(key for _, key in obj.entries)
+                    stack.append(obj.entries)
+
+    # ~~~ Instrumented interpreters ~~~
+
+    def _execute(self, stmt: Stmt) -> None:
+        outer_offset = self._site_offset
+        if stmt.offset >= 0:
+            self._site_offset = stmt.offset
+        try:
+            super()._execute(stmt)
+        finally:
+            self._site_offset = outer_offset
+
+    def _visit_AnonymousFunctionExpr__(self, expr: AnonymousFunctionExpr) -> LoxFunction:
+        function = super()._visit_AnonymousFunctionExpr__(expr)
+        self._track(function, "closure")
+        return function
+
+    def _visit_BinaryExpr__(self, expr: BinaryExpr) -> Union[bool, float, str, LoxVec]:
+        result = super()._visit_BinaryExpr__(expr)
+        if isinstance(result, str) and expr.operator.token_type is Tk.PLUS:
+            self._strings[id(result)] = (self._site("string"), len(result))
+        return result
+
+    def _visit_AppendStmt__(self, stmt: AppendStmt) -> None:
+        # Concatenate strings one at a time rather than through a builder, so that each is accounted for.
+        self._visit_ExpressionStmt__(stmt)
+
+    def _visit_CallExpr__(self, expr: CallExpr) -> LoxObject:
+        result = super()._visit_CallExpr__(expr)
+        if isinstance(result, LoxInstance):
+            self._track(result, "instance")
+        return result
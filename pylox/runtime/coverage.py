@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import DefaultDict, Dict, List, Optional
+
+from pylox.parsing.stmt import Stmt
+from pylox.parsing.walk import walk
+from pylox.runtime.hooks import InterpreterHook
+from pylox.utilities.error import LoxErrorHandler
+
+
+class LineCoverage(InterpreterHook):
+    """Count how many times each statement of a program is executed.
+
+    Counts are kept per statement offset while running and only mapped to lines
+    when a report is requested, so that the per-statement cost stays minimal."""
+
+    def __init__(self) -> None:
+        self._hits: DefaultDict[int, int] = defaultdict(int)
+        self._source = ""
+
+    def begin(self, source: str, ast: List[Stmt]) -> None:
+        """Reset the counts and register every statement of `ast` as executable."""
+        self._source = source
+        self._hits.clear()
+        self.register(ast)
+
+    def register(self, ast: List[Stmt]) -> None:
+        """Register every statement of `ast` as executable, e.g. as a program is parsed piecewise."""
+        for node in walk(ast):
+            if isinstance(node, Stmt):
+                self._hits[node.offset] += 0
+
+    def on_statement(self, stmt: Stmt) -> None:
+        self._hits[stmt.offset] += 1
+
+    def report(self, error_handler: LoxErrorHandler) -> CoverageReport:
+        """Map the collected counts to lines using the line table of `error_handler`.
+
+        A line holding several statements reports the count of the most executed one."""
+        line_hits: Dict[int, int] = dict()
+        for offset, hits in self._hits.items():
+            if offset < 0:  # Synthesized statements have no place in the source.
+                continue
+            line = error_handler.line_number(offset)
+            line_hits[line] = max(line_hits.get(line, 0), hits)
+        return CoverageReport(self._source, dict(sorted(line_hits.items())))
+
+
+@dataclass
+class CoverageReport:
+    source: str
+    line_hits: Dict[int, int]  # Executable line number (1-indexed) to execution count.
+
+    UNEXECUTED_MARKER = "#####"
+    HEAT_BAR_WIDTH = 10
+
+    @property
+    def covered_lines(self) -> int:
+        return sum(1 for hits in self.line_hits.values() if hits)
+
+    def annotate(self) -> str:
+        """Produce the source listing prefixed with hit counts and a bar proportional to each line's hotness.
+
+        Lines without statements are left blank, while executable lines that never ran are flagged."""
+        hottest = max(self.line_hits.values(), default=0)
+        listing = list()
+        for line_number, line in enumerate(self.source.split("\n"), start=1):
+            hits: Optional[int] = self.line_hits.get(line_number)
+            if hits is None:
+                count, bar = "", ""
+            elif hits == 0:
+                count, bar = self.UNEXECUTED_MARKER, ""
+            else:
+                count, bar = str(hits), "#" * max(1, round(self.HEAT_BAR_WIDTH * hits / hottest))
+            listing.append(f"{count:>10} {bar:<{self.HEAT_BAR_WIDTH}} {line_number:>5} | {line}")
+        return "\n".join(listing) + "\n"
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "executable_lines": len(self.line_hits),
+            "covered_lines": self.covered_lines,
+            "lines": {str(line): hits for line, hits in self.line_hits.items()},
+        }, indent=2)
+
+    def write(self, prefix: str) -> None:
+        """Write the annotated listing to `<prefix>.txt` and the counts to `<prefix>.json`."""
+        with open(f"{prefix}.txt", "w") as fil:
+            fil.write(self.annotate())
+        with open(f"{prefix}.json", "w") as fil:
+            fil.write(self.to_json())
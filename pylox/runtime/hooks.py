@@ -0,0 +1,25 @@
+from typing import Sequence
+
+from pylox.language.lox_callable import LoxFunction
+from pylox.language.lox_types import LoxObject
+from pylox.parsing.stmt import Stmt
+from pylox.utilities.error import LoxError
+
+
+class InterpreterHook:
+    """Base class for observers of an `Interpreter`'s execution, attached with `Interpreter.attach_hook()`.
+
+    Every event is a no-op by default; override only those of interest. Hooks are
+    invoked in the order in which they were attached."""
+
+    def on_call(self, function: LoxFunction, args: Sequence[LoxObject]) -> None:
+        """Called before the body of a Lox function (or a constructor) is executed."""
+
+    def on_return(self, function: LoxFunction, value: LoxObject) -> None:
+        """Called after a Lox function returns normally with the value it produced."""
+
+    def on_statement(self, stmt: Stmt) -> None:
+        """Called before each statement, including those nested in blocks and function bodies, is executed."""
+
+    def on_error(self, error: LoxError) -> None:
+        """Called when an error aborts resolution or execution, before it is reported."""
@@ -1,51 +1,200 @@
+from __future__ import annotations
+
 from contextlib import nullcontext
 from operator import add, ge, gt, le, lt, mul
 from operator import pow as op_pow
 from operator import sub
-from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
 
 from pylox.language.lox_callable import LoxCallable, LoxFunction, LoxReturn
 from pylox.language.lox_class import LoxClass, LoxInstance
-from pylox.language.lox_types import (FunctionKind, LoxIdentifier, LoxObject, LoxPrimitive, lox_division, lox_equality,
-                                      lox_object_to_str, lox_truth)
+from pylox.language.lox_indexable import LoxIndexable
+from pylox.language.lox_iterator import lox_iteration, lox_range
+from pylox.language.lox_list import LoxList
+from pylox.language.lox_native import LoxNativeError, LoxNativeFunction
+from pylox.language.lox_types import (FunctionKind, LoxIdentifier, LoxObject, LoxPrimitive, lox_concatenation,
+                                      lox_division, lox_equality, lox_object_to_str, lox_truth)
+from pylox.language.lox_vec import LoxVec, elementwise, vector_division
 from pylox.lexing.token import Tk, Token
 from pylox.parsing.expr import *
 from pylox.parsing.stmt import *
+from pylox.runtime.hooks import InterpreterHook
+from pylox.runtime.natives import native_environment
+from pylox.runtime.output import OutputSink, StreamSink
 from pylox.runtime.resolver import Resolver
+from pylox.runtime.string_builder import StringBuilder
+from pylox.runtime.vectorizer import vectorize_loops
 from pylox.utilities import are_of_expected_type, dump_internal
 from pylox.utilities.error import NOT_REACHED, LoxError, LoxErrorHandler, LoxRuntimeError
 from pylox.utilities.scoped_state_handler import ScopedStateHandler
 from pylox.utilities.stacked_map import StackedMap
 from pylox.utilities.visitor import Visitor
 
+if TYPE_CHECKING:
+    from pylox.snapshot import Snapshot
+
+
+_BINARY_OPERATIONS: Dict[Tk, Callable[[Any, Any], Union[bool, float, str]]] = {
+    # Mathematical operations:
+    Tk.PLUS: add,
+    Tk.MINUS: sub,
+    Tk.STAR: mul,
+    Tk.STAR_STAR: op_pow,
+    Tk.SLASH: lox_division,
+    # Equality:
+    Tk.EQUAL_EQUAL: lox_equality,
+    Tk.BANG_EQUAL: lambda l, r: not lox_equality(l, r),
+    # Comparison:
+    Tk.GREATER: gt,
+    Tk.GREATER_EQUAL: ge,
+    Tk.LESS: lt,
+    Tk.LESS_EQUAL: le,
+}
+
+# Elementwise operations on vectors, which equality is not: vectors are compared by identity like any other object.
+_VECTOR_OPERATIONS: Dict[Tk, Callable[[Any, Any], Any]] = {
+    Tk.PLUS: add,
+    Tk.MINUS: sub,
+    Tk.STAR: mul,
+    Tk.STAR_STAR: op_pow,
+    Tk.SLASH: vector_division,
+    Tk.GREATER: gt,
+    Tk.GREATER_EQUAL: ge,
+    Tk.LESS: lt,
+    Tk.LESS_EQUAL: le,
+}
+
 
 class Interpreter(Visitor[Union[Expr, Stmt], Union[None, LoxObject]]):
     # pylint: disable=invalid-name
     _environment: StackedMap[LoxIdentifier, LoxObject]
 
-    def __init__(self, error_handler: LoxErrorHandler, *, dump: bool = False) -> None:
+    def __init__(
+            self,
+            error_handler: LoxErrorHandler,
+            *,
+            dump: bool = False,
+            output: Optional[OutputSink] = None
+    ) -> None:
         self._error_handler = error_handler
+        self.output = StreamSink() if output is None else output
         self._resolver = Resolver()
+        self._known_globals: Dict[str, LoxIdentifier] = dict()  # Globals restored from a snapshot.
         self.reinitialize_environment()
         self._dump = dump
         self._current_bound_instance: ScopedStateHandler[Optional[LoxInstance]] = ScopedStateHandler(None)
+        self._hooks: List[InterpreterHook] = list()
 
     def interpret(self, ast: List[Stmt]) -> None:
+        self.resolve(ast)
+        self.execute(ast)
+
+    def resolve(self, ast: List[Stmt]) -> None:
+        """Resolve the variables of an AST in place, in preparation for `execute()`."""
         try:
-            self._resolver.resolve(ast)
+            self._resolver.resolve(ast, known_globals=self._known_globals)
+            vectorize_loops(ast)
             if self._dump:
                 dump_internal("AST", *ast)
+        except LoxError as error:
+            self._report_error(error)
+
+    def execute(self, ast: Sequence[Stmt]) -> None:
+        """Execute an AST that has already been resolved."""
+        try:
             for stmt in ast:
                 self._execute(stmt)
         except LoxError as error:
-            self._error_handler.err(error)
+            self._report_error(error)
+
+    def interpret_incrementally(self, statements: Iterable[Stmt]) -> None:
+        """Resolve and execute statements one at a time, as they are produced by `statements`.
+
+        Each statement is resolved in the scope left behind by those before it and executed before
+        the next one is requested, so that a lazily parsed program starts producing output at once.
+        The output of each statement is flushed once it has run, so that it is neither held back by
+        the buffer of the sink while the next is parsed nor reported after a syntax error in it.
+        Once a syntax error has been reported, nothing further is executed but the remaining statements
+        are still drawn from `statements`, so that all syntax errors of a lazily parsed program get reported.
+        A resolution or runtime error ends the run at once, leaving the rest of the program unparsed."""
+        self._resolver.reset(known_globals=self._known_globals)
+        try:
+            for stmt in statements:
+                if self._error_handler.error_state:
+                    continue
+                declaration = [stmt]
+                self._resolver.resolve_further(declaration)
+                vectorize_loops(declaration)
+                if self._dump:
+                    dump_internal("AST", *declaration)
+                self._execute(declaration[0])
+                self.output.flush()
+        except LoxError as error:
+            self._report_error(error)
 
     def reinitialize_environment(self) -> None:
         self._environment = StackedMap()
+        self._environment[0].update(native_environment())
+
+    def define_global(self, uniq_id: LoxIdentifier, value: LoxObject) -> None:
+        self._environment[0][uniq_id] = value
+
+    def get_global(self, uniq_id: LoxIdentifier) -> LoxObject:
+        value = self._environment[0].get(uniq_id)
+        return str(value) if type(value) is StringBuilder else value
+
+    def snapshot(self) -> Snapshot:
+        """Capture the global environment left behind by the most recently interpreted program."""
+        from pylox.snapshot import Snapshot  # pylint: disable=import-outside-toplevel
+        return Snapshot.capture(self._resolver.global_names, self._environment[0])
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """Replace the environment with a copy of a snapshot's. Programs interpreted subsequently
+        see the snapshot's globals as if they had declared them."""
+        self.reinitialize_environment()
+        self._environment[0].update(snapshot.environment())
+        self._known_globals = dict(snapshot.global_ids)
+
+    # ~~~ Tracing hooks ~~~
+
+    def attach_hook(self, hook: InterpreterHook) -> None:
+        """Start delivering execution events to `hook`.
+
+        The untraced interpreter never checks for hooks. Instead, attaching the first hook
+        shadows `_execute()` and `_call()` with instrumented versions on this instance only."""
+        self._hooks.append(hook)
+        self._execute = self._traced_execute  # type: ignore
+        self._call = self._traced_call  # type: ignore
+
+    def detach_hook(self, hook: InterpreterHook) -> None:
+        """Stop delivering events to `hook`, restoring the untraced fast path once no hooks remain."""
+        self._hooks.remove(hook)
+        if not self._hooks:
+            del self._execute
+            del self._call
+
+    def _traced_execute(self, stmt: Stmt) -> None:
+        for hook in self._hooks:
+            hook.on_statement(stmt)
+        type(self)._execute(self, stmt)
+
+    def _traced_call(self, callee: LoxFunction, arguments: Sequence[LoxObject]) -> LoxObject:
+        for hook in self._hooks:
+            hook.on_call(callee, arguments)
+        value = type(self)._call(self, callee, arguments)
+        for hook in self._hooks:
+            hook.on_return(callee, value)
+        return value
+
+    def _report_error(self, error: LoxError) -> None:
+        for hook in self._hooks:
+            hook.on_error(error)
+        self.output.flush()  # Let everything printed before the error appear before its report.
+        self._error_handler.err(error)
 
     # ~~~ Helper functions ~~~
 
-    def _execute(self, stmt: Stmt) -> None:
+    def _execute(self, stmt: Stmt) -> None:  # pylint: disable=method-hidden  # Shadowed by `attach_hook()`.
         self.visit(stmt)
 
     def _evaluate(self, expr: Expr) -> LoxObject:
@@ -69,7 +218,11 @@ class Interpreter(Visitor[Union[Expr, Stmt], Union[None, LoxObject]]):
 
     # ~~~ Callable interpreter ~~~
 
-    def _call(self, callee: LoxFunction, arguments: Sequence[LoxObject]) -> LoxObject:
+    def _call(  # pylint: disable=method-hidden  # Shadowed by `attach_hook()`.
+            self,
+            callee: LoxFunction,
+            arguments: Sequence[LoxObject]
+    ) -> LoxObject:
         try:
             with self._environment.graft(callee.closure), self._environment.scope():
                 with self._current_bound_instance.enter(callee.bound_instance):
@@ -101,6 +254,35 @@ class Interpreter(Visitor[Union[Expr, Stmt], Union[None, LoxObject]]):
     def _visit_ExpressionStmt__(self, stmt: ExpressionStmt) -> None:
         self._evaluate(stmt.expression)
 
+    def _visit_AppendStmt__(self, stmt: AppendStmt) -> None:
+        assignment = stmt.expression
+        if assignment.target_id is not None:
+            value = self._environment.get(assignment.target_id)
+            if type(value) is StringBuilder or (type(value) is str and len(value) >= StringBuilder.THRESHOLD):
+                self._append(assignment, value)
+                return
+        self._evaluate(assignment)
+
+    def _append(self, assignment: AssignmentExpr, value: Union[str, StringBuilder]) -> None:
+        """Execute `variable = variable + a + b ...` given the value of the variable, a long string.
+
+        The addends are evaluated and checked in the same order as by `_visit_BinaryExpr__()`."""
+        assert assignment.target_id is not None
+        additions: List[BinaryExpr] = list()
+        addend = assignment.value
+        while type(addend) is BinaryExpr:  # The parser guarantees that the innermost operand is the variable.
+            additions.append(addend)
+            addend = addend.left
+        builder = value if isinstance(value, StringBuilder) else StringBuilder.start(value)
+        for addition in reversed(additions):
+            suffix = self._evaluate(addition.right)
+            if not isinstance(suffix, str):  # Added to a string, so the operands are not two numbers.
+                raise LoxRuntimeError.at_token(
+                    addition.operator, "Operands must be two numbers or two strings.", fatal=True
+                )
+            builder = builder.append(suffix)
+        self._environment.assign(assignment.target_id, builder)  # type: ignore  # Only ever read through `str()`.
+
     def _visit_IfStmt__(self, stmt: IfStmt) -> None:
         if lox_truth(self._evaluate(stmt.condition)):
             self._execute(stmt.then_branch)
@@ -108,7 +290,7 @@ class Interpreter(Visitor[Union[Expr, Stmt], Union[None, LoxObject]]):
             self._execute(stmt.else_branch)
 
     def _visit_PrintStmt__(self, stmt: PrintStmt) -> None:
-        print(lox_object_to_str(self._evaluate(stmt.expression)))
+        self.output.write_line(lox_object_to_str(self._evaluate(stmt.expression)))
 
     def _visit_VariableDeclarationStmt__(self, stmt: VariableDeclarationStmt) -> None:
         assert stmt.uniq_id is not None
@@ -126,16 +308,40 @@ class Interpreter(Visitor[Union[Expr, Stmt], Union[None, LoxObject]]):
         while lox_truth(self._evaluate(stmt.condition)):
             self._execute(stmt.body)
 
+    def _visit_ForEachStmt__(self, stmt: ForEachStmt) -> None:
+        assert stmt.uniq_id is not None
+        iterable = self._evaluate(stmt.iterable)
+        end = self._evaluate(stmt.end) if stmt.end is not None else None
+        try:
+            elements = lox_iteration(iterable) if stmt.end is None else lox_range(iterable, end)
+            with self._environment.scope():
+                frame = self._environment[-1]  # The loop variable is rebound in place on every iteration.
+                for element in elements:
+                    frame[stmt.uniq_id] = element
+                    self._execute(stmt.body)
+        except LoxNativeError as error:  # Raised by the iteration itself, such as reading a closed file.
+            raise LoxRuntimeError.at_token(stmt.keyword, error.message, fatal=True)
+
+    def _visit_VectorizedLoopStmt__(self, stmt: VectorizedLoopStmt) -> None:
+        # Hooks expect to observe every statement executed, so loops are only run in bulk when untraced.
+        if self._hooks or not stmt.kernel.run(self._environment.get):
+            self.visit(stmt.loop)
+
     # ~~~ Expression interpreters ~~~
 
     def _visit_AnonymousFunctionExpr__(self, expr: AnonymousFunctionExpr) -> LoxFunction:
-        return LoxFunction(expr, self._environment.tail()).bind_to_instance(self._current_bound_instance.state)
+        return LoxFunction(expr, self._environment.tail(), self._current_bound_instance.state)
 
     def _visit_AssignmentExpr__(self, expr: AssignmentExpr) -> LoxObject:
         if expr.target_id is None:
             raise LoxRuntimeError.at_token(expr.target, f"Undefined variable '{expr.target.lexeme}'.", fatal=True)
         value = self._evaluate(expr.value)
-        self._environment.assign(expr.target_id, value)
+        try:
+            self._environment.assign(expr.target_id, value)
+        except KeyError:  # A predeclared global that was never bound.
+            raise LoxRuntimeError.at_token(
+                expr.target, f"Undefined variable '{expr.target.lexeme}'.", fatal=True
+            ) from None
         return value
 
     def _visit_DynamicAssignmentExpr__(self, expr: DynamicAssignmentExpr) -> LoxObject:
@@ -157,7 +363,7 @@ class Interpreter(Visitor[Union[Expr, Stmt], Union[None, LoxObject]]):
                 expr.attribute, f"Undefined property '{expr.attribute.lexeme}'.", fatal=True
             )
 
-    def _visit_BinaryExpr__(self, expr: BinaryExpr) -> Union[bool, float, str]:
+    def _visit_BinaryExpr__(self, expr: BinaryExpr) -> Union[bool, float, str, LoxVec]:
         """Evaluate the two operands, ensure that their types match, and finally
         apply the correct binary operation.
 
@@ -166,31 +372,26 @@ class Interpreter(Visitor[Union[Expr, Stmt], Union[None, LoxObject]]):
         left = self._evaluate(expr.left)
         right = self._evaluate(expr.right)
 
-        ops: Dict[Tk, Callable[[Any, Any], Union[bool, float, str]]] = {
-            # Mathematical operations:
-            Tk.PLUS: add,
-            Tk.MINUS: sub,
-            Tk.STAR: mul,
-            Tk.STAR_STAR: op_pow,
-            Tk.SLASH: lox_division,
-            # Equality:
-            Tk.EQUAL_EQUAL: lox_equality,
-            Tk.BANG_EQUAL: lambda l, r: not lox_equality(l, r),
-            # Comparison:
-            Tk.GREATER: gt,
-            Tk.GREATER_EQUAL: ge,
-            Tk.LESS: lt,
-            Tk.LESS_EQUAL: le,
-        }
-        if (op := expr.operator.token_type) in ops:  # pylint: disable=superfluous-parens
+        if (op := expr.operator.token_type) in _BINARY_OPERATIONS:  # pylint: disable=superfluous-parens
             # Note that we do not do implicit casts. That Pandora's box is not to be opened...
-            if op is Tk.PLUS:  # Used for both arithmetic addition and string concatenation.
-                self._expect_number_or_string_operand(expr.operator, left, right)
-            elif op in {Tk.BANG_EQUAL, Tk.EQUAL_EQUAL}:  # Equality comparisons are valid on all objects.
-                pass
-            else:  # Arithmetic operations and comparisons.
-                self._expect_number_operand(expr.operator, left, right)
-            return ops[op](left, right)
+            try:
+                if op is Tk.PLUS:  # Used for both arithmetic addition and string concatenation.
+                    self._expect_number_or_string_operand(expr.operator, left, right)
+                elif op in {Tk.BANG_EQUAL, Tk.EQUAL_EQUAL}:  # Equality comparisons are valid on all objects.
+                    pass
+                else:  # Arithmetic operations and comparisons.
+                    self._expect_number_operand(expr.operator, left, right)
+            except LoxRuntimeError:
+                # Vectors are checked for only once the common case has failed, so that it does not pay for them.
+                if op in _VECTOR_OPERATIONS and (isinstance(left, LoxVec) or isinstance(right, LoxVec)):
+                    try:
+                        return elementwise(_VECTOR_OPERATIONS[op], left, right)
+                    except LoxNativeError as error:
+                        raise LoxRuntimeError.at_token(expr.operator, error.message, fatal=True)
+                raise
+            if op is Tk.PLUS and type(left) is str and type(right) is str:  # Either both are strings or neither is.
+                return lox_concatenation(left, right)
+            return _BINARY_OPERATIONS[op](left, right)
 
         raise NOT_REACHED
 
@@ -201,11 +402,20 @@ class Interpreter(Visitor[Union[Expr, Stmt], Union[None, LoxObject]]):
         if not isinstance(callee, LoxCallable):
             raise LoxRuntimeError.at_token(expr.paren, "Can only call functions and classes.")
         if (found := len(arguments)) != (expected := callee.arity):
-            raise LoxRuntimeError.at_token(expr.paren, f"Expected {expected} arguments but got {found}.")
+            if not (isinstance(callee, LoxNativeFunction) and callee.variadic):
+                raise LoxRuntimeError.at_token(expr.paren, f"Expected {expected} arguments but got {found}.")
+            if found < expected:
+                raise LoxRuntimeError.at_token(expr.paren, f"Expected at least {expected} arguments but got {found}.")
 
         if isinstance(callee, LoxFunction):
             return self._call(callee, arguments)
 
+        if isinstance(callee, LoxNativeFunction):
+            try:
+                return callee.function(*arguments)
+            except LoxNativeError as error:
+                raise LoxRuntimeError.at_token(expr.paren, error.message, fatal=True)
+
         if isinstance(callee, LoxClass):
             instance = LoxInstance(callee)
             if callee.constructor:
@@ -214,6 +424,35 @@ class Interpreter(Visitor[Union[Expr, Stmt], Union[None, LoxObject]]):
 
         raise NOT_REACHED
 
+    def _visit_IndexExpr__(self, expr: IndexExpr) -> LoxObject:
+        target = self._evaluate(expr.target)
+        index = self._evaluate(expr.index)
+        if not isinstance(target, LoxIndexable):
+            raise LoxRuntimeError.at_token(expr.bracket, "Only lists and maps can be indexed.", fatal=True)
+        try:
+            return target.get_item(index)
+        except LoxNativeError as error:
+            raise LoxRuntimeError.at_token(expr.bracket, error.message, fatal=True)
+
+    def _visit_IndexAssignmentExpr__(self, expr: IndexAssignmentExpr) -> LoxObject:
+        target = self._evaluate(expr.target.target)
+        index = self._evaluate(expr.target.index)
+        if not isinstance(target, LoxIndexable):
+            raise LoxRuntimeError.at_token(expr.target.bracket, "Only lists and maps can be indexed.", fatal=True)
+        value = self._evaluate(expr.value)
+        try:
+            target.set_item(index, value)
+        except LoxNativeError as error:
+            raise LoxRuntimeError.at_token(expr.target.bracket, error.message, fatal=True)
+        return value
+
+    def _visit_InterpolationExpr__(self, expr: InterpolationExpr) -> str:
+        # One join, rather than a concatenation (and a type check) per part.
+        return "".join([lox_object_to_str(self._evaluate(part)) for part in expr.parts])
+
+    def _visit_ListExpr__(self, expr: ListExpr) -> LoxList:
+        return LoxList([self._evaluate(element) for element in expr.elements])
+
     def _visit_GroupingExpr__(self, expr: GroupingExpr) -> LoxObject:
         """Evaluate a group by evaluating the expression contained within."""
         return self._evaluate(expr.expression)
@@ -261,4 +500,12 @@ class Interpreter(Visitor[Union[Expr, Stmt], Union[None, LoxObject]]):
     def _visit_VariableExpr__(self, expr: VariableExpr) -> LoxObject:
         if expr.target_id is None:
             raise LoxRuntimeError.at_token(expr.target, f"Undefined variable '{expr.target.lexeme}'.", fatal=True)
-        return self._environment.get(expr.target_id)
+        try:
+            value = self._environment.get(expr.target_id)
+        except KeyError:  # A predeclared global that was never bound.
+            raise LoxRuntimeError.at_token(
+                expr.target, f"Undefined variable '{expr.target.lexeme}'.", fatal=True
+            ) from None
+        if type(value) is StringBuilder:  # Only `AppendStmt`s ever see builders.
+            return str(value)
+        return value
@@ -0,0 +1,10 @@
+"""The native functions available to Lox programs.
+
+Natives are registered by the modules implementing them; importing this module
+guarantees that all of them are registered before they are looked up."""
+
+# pylint: disable=unused-import
+from pylox.language import lox_indexable, lox_io, lox_iterator, lox_list, lox_map, lox_math, lox_vec
+from pylox.language.lox_native import native_environment, native_ids
+
+__all__ = ("native_environment", "native_ids")
@@ -0,0 +1,84 @@
+import sys
+from abc import ABC, abstractmethod
+from typing import List, Optional, TextIO
+
+
+class OutputSink(ABC):
+    """Destination of the output of Lox `print` statements."""
+
+    @abstractmethod
+    def write_line(self, line: str) -> None:
+        """Output a line; the newline is added by the sink."""
+
+    def flush(self) -> None:
+        """Write out anything still held back by the sink."""
+
+
+class StreamSink(OutputSink):
+    """Write to a text stream through a large in-memory buffer.
+
+    Printing a line costs one list append; the buffer is written to the stream in a single call
+    once it grows past `buffer_size` characters, and whenever `flush()` is called. When writing to
+    a terminal, every line is written out at once instead, so that interactive output stays timely.
+    """
+
+    DEFAULT_BUFFER_SIZE = 64 * 1024
+
+    def __init__(
+            self,
+            stream: Optional[TextIO] = None,
+            *,
+            line_buffered: Optional[bool] = None,
+            buffer_size: int = DEFAULT_BUFFER_SIZE
+    ) -> None:
+        """Create a sink writing to `stream`.
+
+        :param stream: where to write, defaults to stdout (looked up on each write)
+        :type stream: Optional[TextIO], optional
+        :param line_buffered: whether to write out every line at once, defaults to whether the stream is a TTY
+        :type line_buffered: Optional[bool], optional
+        :param buffer_size: number of buffered characters that triggers a write, defaults to 64 KiB
+        :type buffer_size: int, optional
+        """
+        self._stream = stream
+        if line_buffered is None:
+            line_buffered = self._target().isatty()
+        self._buffer_size = 0 if line_buffered else buffer_size
+        self._parts: List[str] = list()
+        self._buffered = 0
+
+    def _target(self) -> TextIO:
+        return sys.stdout if self._stream is None else self._stream
+
+    def write_line(self, line: str) -> None:
+        self._parts.append(line)
+        self._parts.append("\n")
+        self._buffered += len(line) + 1
+        if self._buffered > self._buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._parts:
+            target = self._target()
+            target.write("".join(self._parts))
+            target.flush()
+            self._parts.clear()
+            self._buffered = 0
+
+
+class MemorySink(OutputSink):
+    """Collect output in memory, for embedding and testing."""
+
+    def __init__(self) -> None:
+        self._parts: List[str] = list()
+
+    def write_line(self, line: str) -> None:
+        self._parts.append(line)
+        self._parts.append("\n")
+
+    def getvalue(self) -> str:
+        """Return everything output so far."""
+        return "".join(self._parts)
+
+    def clear(self) -> None:
+        self._parts.clear()
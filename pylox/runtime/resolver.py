@@ -1,16 +1,44 @@
 from collections import abc
 from contextlib import nullcontext
-from typing import List, Optional, Union
+from threading import Lock
+from typing import Dict, Iterable, List, Mapping, Optional, Union
 
 from pylox.language.lox_types import FunctionKind, LoxIdentifier
 from pylox.lexing.token import Token
 from pylox.parsing.expr import *
 from pylox.parsing.stmt import *
+from pylox.runtime.natives import native_ids
 from pylox.utilities.error import LoxSyntaxError
 from pylox.utilities.scoped_state_handler import ScopedStateHandler
 from pylox.utilities.stacked_map import StackedMap
 from pylox.utilities.visitor import Visitor
 
+# Identifiers are drawn from a single process-wide counter, so that they stay unique across resolvers
+# (including ones running concurrently in several threads) and remain meaningful when resolved state
+# is saved to, and restored from, a snapshot.
+_identifier_lock = Lock()
+_last_identifier = 0
+
+
+def _new_identifier() -> LoxIdentifier:
+    global _last_identifier  # pylint: disable=global-statement, invalid-name
+    with _identifier_lock:
+        _last_identifier += 1
+        return LoxIdentifier(_last_identifier)
+
+
+def reserve_identifiers(last: LoxIdentifier) -> None:
+    """Ensure that identifiers up to and including `last` are never handed out again."""
+    global _last_identifier  # pylint: disable=global-statement, invalid-name
+    with _identifier_lock:
+        _last_identifier = max(_last_identifier, last)
+
+
+def identifier_watermark() -> LoxIdentifier:
+    """Return the greatest identifier handed out so far."""
+    with _identifier_lock:
+        return LoxIdentifier(_last_identifier)
+
 
 class Resolver(Visitor[Union[Expr, Stmt], None]):
     def __init__(self) -> None:
@@ -19,11 +47,49 @@ class Resolver(Visitor[Union[Expr, Stmt], None]):
         self._is_resolving_class: ScopedStateHandler[bool] = ScopedStateHandler(False)
         self._is_resolving_constructor: ScopedStateHandler[bool] = ScopedStateHandler(False)
 
-    def resolve(self, ast: List[Stmt]) -> None:
+    def resolve(
+            self,
+            ast: List[Stmt],
+            predeclared: Iterable[Token] = (),
+            known_globals: Optional[Mapping[str, LoxIdentifier]] = None
+    ) -> None:
+        """Resolve an AST in place.
+
+        :param ast: statements to resolve
+        :type ast: List[Stmt]
+        :param predeclared: globals to declare before resolving, as if defined by the program, defaults to ()
+        :type predeclared: Iterable[Token], optional
+        :param known_globals: globals that already exist in the environment, such as those restored
+            from a snapshot, by name, defaults to None
+        :type known_globals: Optional[Mapping[str, LoxIdentifier]], optional
+        """
+        self.reset(predeclared, known_globals)
+        self.resolve_further(ast)
+
+    def reset(
+            self,
+            predeclared: Iterable[Token] = (),
+            known_globals: Optional[Mapping[str, LoxIdentifier]] = None
+    ) -> None:
+        """Forget all previously resolved variables, then declare the given globals. See `resolve()`."""
         self._resolved_vars.clear()
+        self._resolved_vars[0].update(native_ids())
+        self._resolved_vars[0].update(known_globals or {})
+        for ident in predeclared:
+            self._register_ident(ident)
+
+    def resolve_further(self, ast: Iterable[Stmt]) -> None:
+        """Resolve statements in place, in the global scope left behind by previous calls.
+
+        This allows a program to be resolved piecewise, one top-level declaration at a time."""
         for stmt in ast:
             self.visit(stmt)
 
+    @property
+    def global_names(self) -> Dict[str, LoxIdentifier]:
+        """The globals known after the last resolution, by name, excluding native functions."""
+        return {name: uniq_id for name, uniq_id in self._resolved_vars[0].items() if uniq_id > 0}
+
     def visit(self, visitable: Union[Expr, Stmt]) -> None:
         # Blanket impl.
         if isinstance(visitable, (Expr, Stmt)) and not isinstance(visitable, (
@@ -32,6 +98,7 @@ class Resolver(Visitor[Union[Expr, Stmt], None]):
                 VariableExpr,
                 GroupingDirective,
                 ClassDeclarationStmt,
+                ForEachStmt,
                 VariableDeclarationStmt,
         )):
             # Diagnostics.
@@ -57,7 +124,7 @@ class Resolver(Visitor[Union[Expr, Stmt], None]):
             raise LoxSyntaxError.at_token(
                 ident, "Variable with this name already declared in this scope.", fatal=True
             )
-        uniq_id = LoxIdentifier(id(ident) ^ id(self))
+        uniq_id = _new_identifier()
         self._resolved_vars.define(ident.lexeme, uniq_id)
         return uniq_id
 
@@ -98,6 +165,14 @@ class Resolver(Visitor[Union[Expr, Stmt], None]):
             for item in stmt.instance_variables:
                 self.visit(item)
 
+    def _visit_ForEachStmt__(self, stmt: ForEachStmt) -> None:
+        self.visit(stmt.iterable)
+        if stmt.end is not None:
+            self.visit(stmt.end)
+        with self._resolved_vars.scope():
+            stmt.uniq_id = self._register_ident(stmt.ident)
+            self.visit(stmt.body)
+
     def _visit_VariableDeclarationStmt__(self, stmt: VariableDeclarationStmt) -> None:
         # HACK: special-case function declarations by registering the name before
         # resolving the body to allow recursion.
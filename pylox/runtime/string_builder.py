@@ -0,0 +1,49 @@
+from typing import Any, List, Optional, Tuple
+
+
+class StringBuilder:
+    """A long string being built by repeated appends to a variable, kept as the list of its parts.
+
+    Builders are only ever stored in variables, by `AppendStmt`s, and are turned into a string by
+    `str()` whenever the variable is read; Lox code never sees them. The string is joined once and
+    cached, so that reading a variable repeatedly between appends does not join it again.
+
+    Builders share their list of parts: appending to a builder which describes the whole list
+    extends the list in place, so that a chain of appends takes linear time overall. Appending to a
+    builder describing only a prefix of the list (because the chain was forked, say by assigning the
+    variable to another) copies that prefix first, so that every builder keeps its own value."""
+
+    __slots__ = ("_parts", "_count", "_length", "_string")
+
+    # Shorter strings are concatenated as usual, which is faster than building them.
+    THRESHOLD = 256
+
+    def __init__(self, parts: List[str], count: int, length: int) -> None:
+        self._parts = parts
+        self._count = count
+        self._length = length
+        self._string: Optional[str] = None
+
+    @classmethod
+    def start(cls, prefix: str) -> "StringBuilder":
+        return cls([prefix], 1, len(prefix))
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, suffix: str) -> "StringBuilder":
+        """Return a builder for this string followed by `suffix`; this builder is left untouched."""
+        parts = self._parts
+        if self._count != len(parts):
+            parts = parts[:self._count]
+        parts.append(suffix)
+        return StringBuilder(parts, self._count + 1, self._length + len(suffix))
+
+    def __str__(self) -> str:
+        if self._string is None:
+            self._string = "".join(self._parts[:self._count])
+        return self._string
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Builders are an implementation detail of variables: snapshots and copies hold plain strings.
+        return (str, (str(self), ))
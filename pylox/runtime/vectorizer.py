@@ -0,0 +1,298 @@
+"""Auto-vectorization of simple numeric loops over lists.
+
+A loop of the shape produced by desugaring
+
+```
+for (var i = START; i < BOUND; i = i + 1) {
+    c[i] = a[i] * 2 + b[i];
+    // ...
+}
+```
+
+whose body only assigns elementwise arithmetic (`+ - * /` and negation) over the lists at index
+`i`, numbers, loop-invariant variables and `i` itself, is replaced by a `VectorizedLoopStmt`.
+Each of its assignments is then executed as a single bulk operation over a whole slice of the
+lists. `<=` bounds, and `len(list)` as `START` or `BOUND`, are recognized as well.
+
+Since every iteration only reads and writes index `i`, executing the assignments one after the
+other over all indices is equivalent to executing them one iteration at a time, even if some of
+the lists are one and the same. What cannot be known before run time (the types of the values
+involved and the lengths of the lists) is checked before anything is written: should any check
+fail, the original loop is executed instead, reproducing the errors it raises."""
+
+from itertools import repeat
+from math import ceil, floor, isfinite
+from operator import add, mul, neg, sub
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from pylox.language.lox_list import LoxList
+from pylox.language.lox_native import native_function
+from pylox.language.lox_types import LoxIdentifier, LoxObject, lox_division
+from pylox.lexing.token import Tk
+from pylox.parsing.expr import *
+from pylox.parsing.stmt import BlockStmt, ExpressionStmt, Stmt, VariableDeclarationStmt, VectorizedLoopStmt, WhileStmt
+from pylox.parsing.walk import walk
+from pylox.utilities import ast_node_repr
+
+Lookup = Callable[[LoxIdentifier], LoxObject]
+Column = Union[float, List[float]]  # Numbers are broadcast over the whole slice.
+
+_OPERATIONS: Dict[Tk, Callable[[float, float], float]] = {
+    Tk.PLUS: add,
+    Tk.MINUS: sub,
+    Tk.STAR: mul,
+    Tk.SLASH: lox_division,
+}
+
+
+class _NotVectorizable(Exception):
+    """Raised when a kernel cannot prove that executing in bulk is equivalent to executing the loop."""
+
+
+class LoopKernel:
+    def __init__(
+            self,
+            counter: LoxIdentifier,
+            start: Expr,
+            bound: Expr,
+            inclusive: bool,
+            assignments: List[IndexAssignmentExpr]
+    ) -> None:
+        self.counter = counter
+        self.start = start
+        self.bound = bound
+        self.inclusive = inclusive  # Whether the condition is `i <= BOUND` rather than `i < BOUND`.
+        self.assignments = assignments
+
+    def __repr__(self) -> str:
+        return ast_node_repr(self)
+
+    def run(self, lookup: Lookup) -> bool:
+        """Execute the loop in bulk, looking variables up with `lookup`.
+
+        :return: whether the loop was executed; if not, nothing was evaluated that the loop would not have
+        :rtype: bool
+        """
+        try:
+            span = self._span(lookup)
+            if not span:
+                return True  # The loop would not have executed its body even once.
+            self._check(lookup, span)
+        except _NotVectorizable:
+            return False
+        for assignment in self.assignments:
+            target = lookup(assignment.target.target.target_id)  # type: ignore
+            assert isinstance(target, LoxList)  # Ensured by `_check()`.
+            column = self._evaluate(assignment.value, lookup, span)
+            target.elements[span.start:span.stop] = [column] * len(span) if isinstance(column, float) else column
+        return True
+
+    def _span(self, lookup: Lookup) -> range:
+        start = self._invariant(self.start, lookup)
+        bound = self._invariant(self.bound, lookup)
+        if not start.is_integer() or start < 0 or not isfinite(bound):
+            raise _NotVectorizable
+        return range(int(start), floor(bound) + 1 if self.inclusive else ceil(bound))
+
+    def _check(self, lookup: Lookup, span: range) -> None:
+        """Ensure that every value involved is a number and every list long enough, as if the
+        assignments had been executed one after the other."""
+        written: Set[int] = set()  # Lists by identity, as several variables may refer to the same one.
+        for assignment in self.assignments:
+            self._check_value(assignment.value, lookup, span, written)
+            written.add(id(self._list(assignment.target.target, lookup, span)))
+
+    def _check_value(self, expr: Expr, lookup: Lookup, span: range, written: Set[int]) -> None:
+        if isinstance(expr, IndexExpr):
+            elements = self._list(expr.target, lookup, span)
+            if id(elements) not in written and any(type(e) is not float for e in elements[span.start:span.stop]):
+                raise _NotVectorizable
+        elif isinstance(expr, VariableExpr):
+            if expr.target_id != self.counter:
+                self._invariant(expr, lookup)
+        elif isinstance(expr, GroupingExpr):
+            self._check_value(expr.expression, lookup, span, written)
+        elif isinstance(expr, UnaryExpr):
+            self._check_value(expr.right, lookup, span, written)
+        elif isinstance(expr, BinaryExpr):
+            self._check_value(expr.left, lookup, span, written)
+            self._check_value(expr.right, lookup, span, written)
+
+    @staticmethod
+    def _list(expr: Expr, lookup: Lookup, span: range) -> List[LoxObject]:
+        lox_list = _lookup(expr, lookup)
+        if not isinstance(lox_list, LoxList) or len(lox_list.elements) < span.stop:
+            raise _NotVectorizable
+        return lox_list.elements
+
+    @staticmethod
+    def _invariant(expr: Expr, lookup: Lookup) -> float:
+        """Evaluate an expression matched by `_is_invariant()`, which must produce a number."""
+        if isinstance(expr, CallExpr):
+            if _lookup(expr.callee, lookup) is not native_function("len"):
+                raise _NotVectorizable  # Any other function might have side effects.
+            lox_list = _lookup(expr.arguments[0], lookup)
+            if not isinstance(lox_list, LoxList):
+                raise _NotVectorizable
+            return float(len(lox_list.elements))
+        value = expr.value if isinstance(expr, LiteralExpr) else _lookup(expr, lookup)
+        if type(value) is not float:
+            raise _NotVectorizable
+        return value
+
+    def _evaluate(self, expr: Expr, lookup: Lookup, span: range) -> Column:
+        if isinstance(expr, LiteralExpr):
+            return expr.value  # type: ignore
+        if isinstance(expr, VariableExpr):
+            if expr.target_id == self.counter:
+                return [float(index) for index in span]
+            return lookup(expr.target_id)  # type: ignore
+        if isinstance(expr, IndexExpr):
+            return lookup(expr.target.target_id).elements[span.start:span.stop]  # type: ignore
+        if isinstance(expr, GroupingExpr):
+            return self._evaluate(expr.expression, lookup, span)
+        if isinstance(expr, UnaryExpr):
+            right = self._evaluate(expr.right, lookup, span)
+            return -right if isinstance(right, float) else list(map(neg, right))
+        assert isinstance(expr, BinaryExpr)
+        operation = _OPERATIONS[expr.operator.token_type]
+        left = self._evaluate(expr.left, lookup, span)
+        right = self._evaluate(expr.right, lookup, span)
+        if isinstance(left, float) and isinstance(right, float):
+            return operation(left, right)
+        return list(map(
+            operation,
+            repeat(left, len(span)) if isinstance(left, float) else left,
+            repeat(right, len(span)) if isinstance(right, float) else right,
+        ))
+
+
+def _lookup(expr: Expr, lookup: Lookup) -> LoxObject:
+    assert isinstance(expr, VariableExpr)
+    if expr.target_id is None:
+        raise _NotVectorizable
+    try:
+        return lookup(expr.target_id)
+    except KeyError:
+        raise _NotVectorizable from None
+
+
+def vectorize_loops(ast: List[Stmt]) -> None:
+    """Replace every vectorizable loop in a resolved AST, however deeply nested, by a `VectorizedLoopStmt`."""
+    _vectorize_items(ast)
+    for node in walk(ast):
+        if isinstance(node, VectorizedLoopStmt):
+            continue  # Do not vectorize the original loop kept for the fallback all over again.
+        for name, attr in vars(node).items():
+            if isinstance(attr, BlockStmt) and (vectorized := _match_loop(attr)) is not None:
+                setattr(node, name, vectorized)
+            elif isinstance(attr, list):
+                _vectorize_items(attr)
+
+
+def _vectorize_items(nodes: List[Any]) -> None:
+    for index, node in enumerate(nodes):
+        if isinstance(node, BlockStmt) and (vectorized := _match_loop(node)) is not None:
+            nodes[index] = vectorized
+
+
+def _match_loop(block: BlockStmt) -> Optional[VectorizedLoopStmt]:
+    if len(block.body) != 2:
+        return None
+    declaration, loop = block.body
+    if not isinstance(declaration, VariableDeclarationStmt) or type(loop) is not WhileStmt:
+        return None
+    counter = declaration.uniq_id
+    condition = loop.condition
+    if (
+        counter is None
+        or not _is_invariant(declaration.initializer, counter)
+        or type(condition) is not BinaryExpr
+        or condition.operator.token_type not in {Tk.LESS, Tk.LESS_EQUAL}
+        or not _is_variable(condition.left, counter)
+        or not _is_invariant(condition.right, counter)
+        or type(loop.body) is not BlockStmt
+        or len(loop.body.body) != 2
+    ):
+        return None
+
+    body, increment = loop.body.body
+    if not _is_increment(increment, counter):
+        return None
+    statements = body.body if type(body) is BlockStmt else [body]
+    assignments: List[IndexAssignmentExpr] = list()
+    for stmt in statements:
+        if type(stmt) is not ExpressionStmt or type(stmt.expression) is not IndexAssignmentExpr:
+            return None
+        assignment = stmt.expression
+        if (
+            not _is_element(assignment.target, counter)
+            or not _is_elementwise(assignment.value, counter)
+        ):
+            return None
+        assignments.append(assignment)
+
+    assert declaration.initializer is not None
+    kernel = LoopKernel(
+        counter, declaration.initializer, condition.right, condition.operator.token_type is Tk.LESS_EQUAL, assignments
+    )
+    return VectorizedLoopStmt(block, kernel)
+
+
+def _is_variable(expr: Optional[Expr], uniq_id: LoxIdentifier) -> bool:
+    return type(expr) is VariableExpr and expr.target_id == uniq_id
+
+
+def _is_other_variable(expr: Optional[Expr], counter: LoxIdentifier) -> bool:
+    return type(expr) is VariableExpr and expr.target_id is not None and expr.target_id != counter
+
+
+def _is_invariant(expr: Optional[Expr], counter: LoxIdentifier) -> bool:
+    """Match a number, a variable other than the counter, or a call `len(list)`."""
+    if type(expr) is LiteralExpr:
+        return type(expr.value) is float
+    if type(expr) is CallExpr:
+        return (
+            _is_other_variable(expr.callee, counter)
+            and len(expr.arguments) == 1
+            and _is_other_variable(expr.arguments[0], counter)
+        )
+    return _is_other_variable(expr, counter)
+
+
+def _is_increment(stmt: Stmt, counter: LoxIdentifier) -> bool:
+    """Match `i = i + 1` and `i = 1 + i`."""
+    if type(stmt) is not ExpressionStmt or type(stmt.expression) is not AssignmentExpr:
+        return False
+    assignment = stmt.expression
+    value = assignment.value
+    if assignment.target_id != counter or type(value) is not BinaryExpr or value.operator.token_type is not Tk.PLUS:
+        return False
+    operands: Tuple[Expr, Expr] = (value.left, value.right)
+    return any(
+        _is_variable(variable, counter) and type(one) is LiteralExpr and one.value == 1.0 and type(one.value) is float
+        for variable, one in (operands, operands[::-1])
+    )
+
+
+def _is_element(expr: Expr, counter: LoxIdentifier) -> bool:
+    """Match `list[i]`."""
+    return type(expr) is IndexExpr and _is_other_variable(expr.target, counter) and _is_variable(expr.index, counter)
+
+
+def _is_elementwise(expr: Expr, counter: LoxIdentifier) -> bool:
+    if type(expr) is LiteralExpr:
+        return type(expr.value) is float
+    if type(expr) is VariableExpr:
+        return expr.target_id is not None
+    if type(expr) is GroupingExpr:
+        return _is_elementwise(expr.expression, counter)
+    if type(expr) is UnaryExpr:
+        return expr.operator.token_type is Tk.MINUS and _is_elementwise(expr.right, counter)
+    if type(expr) is BinaryExpr:
+        return (
+            expr.operator.token_type in _OPERATIONS
+            and _is_elementwise(expr.left, counter)
+            and _is_elementwise(expr.right, counter)
+        )
+    return _is_element(expr, counter)
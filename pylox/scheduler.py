@@ -0,0 +1,176 @@
+import sys
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from statistics import median
+from threading import Semaphore, Thread
+from time import perf_counter
+from typing import Deque, List, Mapping, Optional
+
+from pylox.batch import discover_jobs, write_prefixed
+from pylox.language.lox_types import LoxObject
+from pylox.lox import Lox
+from pylox.parsing.stmt import Stmt
+from pylox.program import Program, RunResult
+from pylox.runtime.hooks import InterpreterHook
+from pylox.utilities.configuration import Debug
+from pylox.utilities.error import LoxCompileError
+
+# Every program being interleaved holds a thread of its own, so their number must be bounded.
+DEFAULT_MAX_ACTIVE = 64
+
+
+@dataclass
+class TaskResult:
+    name: str
+    result: RunResult
+    slices: int  # Number of time slices the task was given.
+    latency: float  # Time from the start of scheduling to the completion of the task.
+
+
+class _Task(InterpreterHook):
+    """A program running on a thread of its own, which only ever executes while the scheduler waits for it.
+
+    The thread serves as a continuation: after every `time_slice` statements, it hands control
+    back to the scheduler and blocks until it is resumed."""
+
+    def __init__(
+            self,
+            name: str,
+            program: Program,
+            bindings: Optional[Mapping[str, LoxObject]],
+            time_slice: int
+    ) -> None:
+        self.name = name
+        self.result: Optional[RunResult] = None
+        self.slices = 0
+        self._program = program
+        self._bindings = bindings
+        self._time_slice = time_slice
+        self._remaining = time_slice
+        self._resumed = Semaphore(0)
+        self._suspended = Semaphore(0)
+        self._thread = Thread(target=self._main, name=f"pylox task {name}", daemon=True)
+
+    @property
+    def done(self) -> bool:
+        return self.result is not None
+
+    def step(self) -> None:
+        """Run the task for one time slice, or until it completes."""
+        self.slices += 1
+        if not self._thread.is_alive():
+            self._thread.start()
+        self._resumed.release()
+        self._suspended.acquire()
+
+    def on_statement(self, stmt: Stmt) -> None:
+        self._remaining -= 1
+        if self._remaining == 0:
+            self._remaining = self._time_slice
+            self._suspended.release()
+            self._resumed.acquire()
+
+    def _main(self) -> None:
+        self._resumed.acquire()
+        try:
+            self.result = self._program.run(self._bindings, hooks=(self, ))
+        except Exception as error:  # pylint: disable=broad-except
+            self.result = RunResult(
+                "", f"Pylox crashed due to an internal {type(error).__name__}: {error}\n", 1, dict()
+            )
+        finally:
+            self._suspended.release()
+
+
+class Scheduler:
+    """Run many programs interleaved in a single process, round-robin.
+
+    Each program is given a time slice measured in executed statements, after which the next one
+    runs. A long-running program thus delays the others by at most one time slice per round, rather
+    than until it completes. Only one program executes at any time."""
+
+    def __init__(self, time_slice: int = 1000, max_active: int = DEFAULT_MAX_ACTIVE) -> None:
+        """Create a scheduler with no programs.
+
+        :param time_slice: number of statements each program may execute before yielding, defaults to 1000
+        :type time_slice: int, optional
+        :param max_active: number of programs interleaved at once, and thus of threads alive at once,
+            the rest waiting for one of them to complete, defaults to DEFAULT_MAX_ACTIVE
+        :type max_active: int, optional
+        """
+        if time_slice < 1:
+            raise ValueError("The time slice must be at least one statement.")
+        if max_active < 1:
+            raise ValueError("At least one program must be active at once.")
+        self._time_slice = time_slice
+        self._max_active = max_active
+        self._pending: Deque[_Task] = deque()
+
+    def submit(self, name: str, program: Program, bindings: Optional[Mapping[str, LoxObject]] = None) -> None:
+        self._pending.append(_Task(name, program, bindings, self._time_slice))
+
+    def run(self) -> List[TaskResult]:
+        """Run all submitted programs to completion, returning their results in order of completion."""
+        results: List[TaskResult] = list()
+        active: Deque[_Task] = deque()
+        start = perf_counter()
+        while self._pending or active:
+            while self._pending and len(active) < self._max_active:
+                active.append(self._pending.popleft())
+            task = active.popleft()
+            task.step()
+            if task.done:
+                assert task.result is not None
+                results.append(TaskResult(task.name, task.result, task.slices, perf_counter() - start))
+            else:
+                active.append(task)
+        return results
+
+
+def run_scheduled(
+        directory: str,
+        *,
+        time_slice: int = 1000,
+        max_active: Optional[int] = None,
+        debug_flags: Debug = Debug(0)
+) -> int:
+    """Run every .lox file under `directory` concurrently under a `Scheduler` and print a summary.
+
+    :param directory: directory to search recursively for scripts
+    :type directory: str
+    :param time_slice: number of statements each script may execute before yielding, defaults to 1000
+    :type time_slice: int, optional
+    :param max_active: number of scripts interleaved at once, defaults to DEFAULT_MAX_ACTIVE
+    :type max_active: Optional[int], optional
+    :param debug_flags: debugging options of the interpreter, defaults to Debug(0)
+    :type debug_flags: Debug, optional
+    :return: 0 if all scripts succeeded, 1 otherwise
+    :rtype: int
+    """
+    root = Path(directory).resolve()
+    lox = Lox(debug_flags)
+    scheduler = Scheduler(time_slice, DEFAULT_MAX_ACTIVE if max_active is None else max_active)
+    failures: List[str] = list()
+    for path in discover_jobs(root):
+        name = str(path.relative_to(root))
+        try:
+            scheduler.submit(name, lox.compile(path.read_text()))
+        except LoxCompileError as error:
+            write_prefixed(error.report, name, sys.stderr)
+            failures.append(name)
+
+    results = scheduler.run()
+    for task in results:
+        write_prefixed(task.result.output, task.name, sys.stdout)
+        write_prefixed(task.result.errors, task.name, sys.stderr)
+        if not task.result.ok:
+            failures.append(task.name)
+
+    print(f"\n{len(results)} scripts run, {len(failures)} failed.")
+    for name in failures:
+        print(f"\tFAILED: {name}")
+    if results:
+        latencies = sorted(task.latency for task in results)
+        print(f"Completion latency: median {median(latencies) * 1000:.3f} ms, max {latencies[-1] * 1000:.3f} ms.")
+    return 1 if failures else 0
@@ -0,0 +1,97 @@
+import gc
+import json
+import os
+import signal
+import socketserver
+import sys
+from typing import Any, Dict, Iterable
+
+from pylox.lox import Lox
+from pylox.program import Program
+from pylox.utilities.configuration import Debug
+from pylox.utilities.error import LoxCompileError
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: "PyloxServer"
+
+    def handle(self) -> None:
+        response = self.server.execute(json.loads(self.rfile.readline()))
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class PyloxServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """A persistent pylox process that executes scripts sent over a Unix domain socket.
+
+    Python startup and the import of pylox are paid once by the server. Each request is then
+    handled in a process forked from the warm server, so that every script runs on an isolated,
+    ready-to-use interpreter. Requests and responses are single lines of JSON; see `pylox.client`.
+
+    Scripts may also be preloaded: they are compiled once by the server, and requests for their
+    paths skip straight to execution. The server's heap is frozen with `gc.freeze()` before each
+    fork, and the collector is disabled in the server, so that the collector of a worker never
+    writes to the preloaded ASTs. They thus stay shared copy-on-write between all workers instead
+    of being duplicated in each one. Workers re-enable the collector as soon as they are forked."""
+
+    def __init__(self, socket_path: str, debug_flags: Debug = Debug(0), preload: Iterable[str] = ()) -> None:
+        if os.path.exists(socket_path):  # Clear out a socket left over by a previous server.
+            os.unlink(socket_path)
+        super().__init__(socket_path, _RequestHandler)
+        self.socket_path = socket_path
+        self.lox = Lox(debug_flags)
+        self.programs: Dict[str, Program] = dict()
+        for path in preload:
+            with open(path, "r") as fil:
+                self.programs[os.path.abspath(path)] = self.lox.compile(fil.read())
+        self._server_pid = os.getpid()
+        # Collections in the server would only churn the pages that workers share; nothing it allocates is garbage.
+        gc.disable()
+
+    def process_request(self, request, client_address):  # type: ignore
+        gc.freeze()  # Runs in the server: move its heap out of the reach of the workers' collectors before forking.
+        super().process_request(request, client_address)
+
+    def finish_request(self, request, client_address):  # type: ignore
+        if os.getpid() != self._server_pid:  # In the forked worker, whose own garbage must be collected as usual.
+            gc.enable()
+        super().finish_request(request, client_address)
+
+    def execute(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the script described by a request.
+
+        A request holds either `source`, the text of the script, or `path`, the location of
+        a script file. The response holds the script's `output`, `errors` and `exit_code`."""
+        try:
+            if "source" in request:
+                program = self.lox.compile(request["source"])
+            elif (preloaded := self.programs.get(request["path"])) is not None:
+                program = preloaded
+            else:
+                with open(request["path"], "r") as fil:
+                    program = self.lox.compile(fil.read())
+            result = program.run()
+            return {"output": result.output, "errors": result.errors, "exit_code": result.exit_code}
+        except LoxCompileError as error:
+            return {"output": "", "errors": error.report, "exit_code": 1}
+        except Exception as error:  # pylint: disable=broad-except
+            return {
+                "output": "",
+                "errors": f"Pylox crashed due to an internal {type(error).__name__}: {error}\n",
+                "exit_code": 1
+            }
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def serve(socket_path: str, debug_flags: Debug = Debug(0), preload: Iterable[str] = ()) -> None:
+    """Serve requests on `socket_path` until interrupted or terminated, with the scripts at
+    the paths in `preload` compiled ahead of time."""
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))  # Let the socket be cleaned up on termination.
+    with PyloxServer(socket_path, debug_flags, preload) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
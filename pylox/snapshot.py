@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import pickle
+from types import MappingProxyType
+from typing import Dict, Mapping
+
+from pylox.language.lox_types import LoxIdentifier, LoxObject
+from pylox.runtime.resolver import identifier_watermark, reserve_identifiers
+
+# Bumped whenever the layout of pickled runtime objects or AST nodes changes.
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+class Snapshot:
+    """The global environment of an interpreter, captured after running a prelude.
+
+    Restoring a snapshot gives an interpreter the prelude's classes, functions and variables
+    without executing the prelude again. The environment is held in serialized form and every
+    call to `environment()` materializes an independent copy of it, so that interpreters started
+    from the same snapshot never observe each other's mutations.
+
+    Note that error reports at tokens of the prelude point into the prelude's source, which is
+    not part of the snapshot."""
+
+    def __init__(self, global_ids: Dict[str, LoxIdentifier], payload: bytes, watermark: LoxIdentifier) -> None:
+        self._global_ids = MappingProxyType(global_ids)
+        self._payload = payload
+        self._watermark = watermark
+        # Identifiers used inside the snapshot may come from another process; never hand them out again.
+        reserve_identifiers(watermark)
+
+    @classmethod
+    def capture(
+            cls,
+            global_ids: Mapping[str, LoxIdentifier],
+            environment: Mapping[LoxIdentifier, LoxObject]
+    ) -> Snapshot:
+        """Snapshot a global environment along with the names of its globals.
+
+        :raises ValueError: if a global holds a value that cannot be snapshotted, such as an open file
+        """
+        try:
+            payload = pickle.dumps(dict(environment), protocol=pickle.HIGHEST_PROTOCOL)
+        except (TypeError, pickle.PicklingError) as error:
+            for name, uniq_id in global_ids.items():
+                try:
+                    pickle.dumps(environment.get(uniq_id), protocol=pickle.HIGHEST_PROTOCOL)
+                except (TypeError, pickle.PicklingError) as global_error:
+                    raise ValueError(f"Cannot snapshot global '{name}': {global_error}.") from None
+            raise ValueError(f"Cannot snapshot the global environment: {error}.") from None
+        return cls(dict(global_ids), payload, identifier_watermark())
+
+    @property
+    def global_ids(self) -> Mapping[str, LoxIdentifier]:
+        """The globals defined by the snapshot, by name."""
+        return self._global_ids
+
+    def environment(self) -> Dict[LoxIdentifier, LoxObject]:
+        """Materialize a fresh copy of the snapshotted global environment."""
+        return pickle.loads(self._payload)
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as fil:
+            pickle.dump(
+                (SNAPSHOT_FORMAT_VERSION, dict(self._global_ids), self._payload, self._watermark),
+                fil,
+                protocol=pickle.HIGHEST_PROTOCOL
+            )
+
+    @classmethod
+    def load(cls, path: str) -> Snapshot:
+        """Load a snapshot written by `save()`.
+
+        :raises ValueError: if the file was written by an incompatible version of pylox
+        """
+        with open(path, "rb") as fil:
+            version, global_ids, payload, watermark = pickle.load(fil)
+        if version != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Snapshot format {version} is not supported (expected {SNAPSHOT_FORMAT_VERSION}).")
+        return cls(global_ids, payload, watermark)
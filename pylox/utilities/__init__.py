@@ -15,11 +15,17 @@ def ast_node_pretty_printer(obj: Any, base_name: str) -> Tuple[str, Iterator[str
     simplified_name = type(obj).__name__.replace(base_name, "").lower()
     attrs = (
         val.lexeme if isinstance(val, Token) else str(val)
-        for val in vars(obj).values()
+        for name, val in vars(obj).items()
+        if name != "offset"  # Source locations are bookkeeping, not part of the tree.
     )
     return simplified_name, attrs
 
 
+def ast_node_repr(obj: Any) -> str:
+    attrs = ", ".join(f"{name}={val!r}" for name, val in vars(obj).items())
+    return f"{type(obj).__name__}({attrs})"
+
+
 def is_arabic_numeral(char: Optional[str]) -> bool:
     if char is None:
         return False
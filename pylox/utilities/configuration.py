@@ -9,3 +9,5 @@ class Debug(Flag):
     JAVA_STYLE_TOKENS = auto()
     REDUCED_ERROR_REPORTING = auto()
     BACKTRACE = auto()
+    TIMINGS = auto()
+    ALLOCATIONS = auto()
@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import sys
 from abc import ABC
-from typing import Any, Iterator, Tuple, Type
+from bisect import bisect_left
+from typing import Any, Iterator, List, Optional, TextIO, Tuple, Type
 
 from pylox.lexing.token import Token
 from pylox.utilities.configuration import Debug
@@ -18,6 +19,14 @@ class LoxExit(SystemExit):
     """System exit requested by pylox due to error in input."""
 
 
+class LoxCompileError(Exception):
+    """Compilation of a Lox program failed due to errors in Lox code."""
+
+    def __init__(self, report: str) -> None:
+        super().__init__(report)
+        self.report = report  # The errors, formatted as they would have been written to stderr.
+
+
 class LoxError(RuntimeError, ABC):
     def __init__(
             self,
@@ -71,18 +80,37 @@ class LoxErrorHandler:
     LINE_NUMBER_SEPARATOR = " | "
     ERROR_MARKER = "^"
 
-    def __init__(self, debug_flags: Debug) -> None:
+    def __init__(self, debug_flags: Debug, *, stream: Optional[TextIO] = None) -> None:
+        """Format and report errors in Lox code.
+
+        :param debug_flags: debugging options
+        :type debug_flags: Debug
+        :param stream: where to write reports, defaults to stderr
+        :type stream: Optional[TextIO], optional
+        """
         self.error_state = False
+        self._stream = stream
         self._source = "\0"
         self._debug_flags = debug_flags
+        self._line_end_offsets: Optional[List[int]] = None
 
     def clear_errors(self) -> None:
         self.error_state = False
 
     def set_source(self, source: str) -> None:
         self._source = source + "\0"
+        self._line_end_offsets = None
         self.clear_errors()
 
+    def line_number(self, offset: int) -> int:
+        """Find the (1-indexed) line on which an offset, as stored in `Token.offset`, is found.
+
+        Unlike error reporting, this is meant for bulk lookups: the line table is
+        built once per source and each lookup is a binary search."""
+        if self._line_end_offsets is None:
+            self._line_end_offsets = [line_end for line_end, _, _ in self._source_as_lines()]
+        return min(bisect_left(self._line_end_offsets, offset), len(self._line_end_offsets) - 1) + 1
+
     def err(self, error: LoxError) -> None:
         """Report an error to stderr.
 
@@ -132,6 +160,12 @@ class LoxErrorHandler:
         offset_from_line_start = offset - line_start_offset + 1  # Calculate the relative offset.
         return line_number, line, offset_from_line_start
 
+    def _print(self, *args: Any) -> None:
+        if self._stream is None:
+            eprint(*args)
+        else:
+            print(*args, file=self._stream)
+
     def _report(self, error_type: str, message: str, length: int, offset: int) -> None:
         """Output a formatted and underlined error and message to stderr."""
         line_number, line, line_offset = self._locate_in_line(offset)
@@ -140,16 +174,16 @@ class LoxErrorHandler:
                 lexeme = f"'{line[line_offset-length:line_offset]}'"
             else:
                 lexeme = "end"
-            eprint(f"[line {line_number}] {error_type} at {lexeme}: {message}")
+            self._print(f"[line {line_number}] {error_type} at {lexeme}: {message}")
         else:
-            eprint(f"\n\t{line_number}{self.LINE_NUMBER_SEPARATOR}{line}")
+            self._print(f"\n\t{line_number}{self.LINE_NUMBER_SEPARATOR}{line}")
             arrow_spacer = "\t" + " " * (
                 len(str(line_number))
                 + len(self.LINE_NUMBER_SEPARATOR)
                 + (line_offset - length)
             )
-            eprint(arrow_spacer + self.ERROR_MARKER * length)
-            eprint(f"{error_type}: Line {line_number}: {message}")
+            self._print(arrow_spacer + self.ERROR_MARKER * length)
+            self._print(f"{error_type}: Line {line_number}: {message}")
 
 
 class catch_internal_error:  # pylint: disable=invalid-name
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Iterator, List, Optional
+
+
+@dataclass
+class PhaseTiming:
+    """Measurements taken over one phase of a pipeline run.
+
+    Note that `tracemalloc` is active while the phase runs, which inflates `wall_time`
+    somewhat. The relative cost of phases remains representative."""
+    name: str
+    wall_time: float
+    peak_memory: int
+    count: Optional[int] = None
+    unit: str = ""
+
+    def __str__(self) -> str:
+        text = f"{self.name:<8}{self.wall_time * 1000:>10.3f} ms{self.peak_memory / 1024:>12.1f} KiB peak"
+        return text if self.count is None else f"{text}{self.count:>10} {self.unit}"
+
+
+@dataclass
+class RunTimings:
+    """Per-phase breakdown of a single `Lox.run()` invocation."""
+    phases: List[PhaseTiming] = field(default_factory=list)
+
+    @property
+    def total_time(self) -> float:
+        return sum(phase.wall_time for phase in self.phases)
+
+    @property
+    def token_count(self) -> Optional[int]:
+        lex = self.get("lex")
+        return lex.count if lex else None
+
+    @property
+    def node_count(self) -> Optional[int]:
+        parse = self.get("parse")
+        return parse.count if parse else None
+
+    def get(self, name: str) -> Optional[PhaseTiming]:
+        return next((phase for phase in self.phases if phase.name == name), None)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[PhaseTiming]:
+        """Measure the wall time and `tracemalloc` peak of the enclosed block as a phase named `name`.
+
+        The phase is recorded even if the block raises, so that a partial breakdown is available."""
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        elif hasattr(tracemalloc, "reset_peak"):  # Python 3.9+.
+            tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        timing = PhaseTiming(name, 0.0, 0)
+        start = perf_counter()
+        try:
+            yield timing
+        finally:
+            timing.wall_time = perf_counter() - start
+            timing.peak_memory = max(tracemalloc.get_traced_memory()[1] - baseline, 0)
+            if not was_tracing:
+                tracemalloc.stop()
+            self.phases.append(timing)
+
+    def __str__(self) -> str:
+        return "\n".join((*map(str, self.phases), f"{'total':<8}{self.total_time * 1000:>10.3f} ms"))
+
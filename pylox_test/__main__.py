@@ -1,3 +1,20 @@
 if __name__ == "__main__":
+    import argparse
+    import os
+
     from pylox_test.test import Tester
-    Tester().test()
+
+    parser = argparse.ArgumentParser(prog="pylox_test", description="Run the pylox test suite")
+    parser.add_argument(
+        "-j",
+        metavar="N",
+        dest="jobs",
+        type=int,
+        nargs="?",
+        const=os.cpu_count() or 1,
+        default=1,
+        help="run tests in N worker processes (all cores if N is omitted)"
+    )
+    args = parser.parse_args()
+
+    Tester(args.jobs).test()
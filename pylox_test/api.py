@@ -0,0 +1,494 @@
+"""api.py
+
+Regression checks for Pylox's embedding API.
+
+The `.lox` test suite only exercises what a Lox program can observe; the checks below cover
+behaviour that is only reachable from Python, such as running a compiled `Program` with missing
+bindings. Run with `python -m pylox_test.api`; exits with a non-zero status if any check fails.
+"""
+
+import contextlib
+import gc
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from pylox import client
+from pylox.batch import run_batch
+from pylox.language.lox_callable import LoxFunction
+from pylox.language.lox_types import LoxObject
+from pylox.lox import Lox
+from pylox.parsing.stmt import Stmt
+from pylox.runtime.hooks import InterpreterHook
+from pylox.runtime.output import MemorySink, StreamSink
+from pylox.scheduler import DEFAULT_MAX_ACTIVE, Scheduler
+from pylox.server import PyloxServer
+from pylox.snapshot import Snapshot
+from pylox.utilities.configuration import Debug
+from pylox.utilities.error import LoxError, LoxExit
+
+CHECKS: List[Callable[[], None]] = list()
+
+# Lets subprocesses import this copy of pylox, whatever their working directory.
+PYLOX_ENVIRONMENT = {**os.environ, "PYTHONPATH": str(Path(__file__).resolve().parent.parent)}
+
+
+def check(function: Callable[[], None]) -> Callable[[], None]:
+    CHECKS.append(function)
+    return function
+
+
+@check
+def unbound_predeclared_global() -> None:
+    """Reading or assigning a predeclared global that was given no binding is a Lox runtime error."""
+    for source in ("print x;", "x = 1;"):
+        result = Lox().compile(source, predeclared=["x"]).run()
+        assert result.exit_code != 0, f"{source!r} should have failed."
+        assert "Undefined variable 'x'." in result.errors, result.errors
+
+
+@check
+def snapshot_of_process_bound_values() -> None:
+    """Snapshotting a global holding a file or an iterator, even indirectly, names the global."""
+    for source, name in (("var f = stdin();", "f"), ("var lazy = [lines(stdin())];", "lazy")):
+        lox = Lox()
+        lox.run(source)
+        try:
+            lox.snapshot()
+        except ValueError as error:
+            assert f"Cannot snapshot global '{name}'" in str(error), str(error)
+        else:
+            raise AssertionError(f"Snapshotting {source!r} should have failed.")
+
+
+@check
+def snapshot_round_trip() -> None:
+    """A saved snapshot is loaded and restored into a new session, including one profiling allocations."""
+    prelude = Lox(Debug.ALLOCATIONS)
+    prelude.run('var greeting = "hello"; fun greet(name) { return greeting + " " + name; }')
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / "prelude.snapshot")
+        prelude.snapshot().save(path)
+        snapshot = Snapshot.load(path)
+    for debug_flags in (Debug(0), Debug.ALLOCATIONS):
+        output = MemorySink()
+        lox = Lox(debug_flags, output=output)
+        lox.restore(snapshot)
+        lox.run('print greet("world");')
+        assert output.getvalue() == "hello world\n", output.getvalue()
+        assert not lox.error_handler.error_state
+
+
+class _RecordingStream(io.StringIO):
+    """A stream recording each write, tagged with the name of the stream, to a log shared with other streams."""
+
+    def __init__(self, name: str, log: List[Tuple[str, str]]) -> None:
+        super().__init__()
+        self._name = name
+        self._log = log
+
+    def write(self, text: str) -> int:
+        self._log.append((self._name, text))
+        return len(text)
+
+    def isatty(self) -> bool:
+        return False
+
+
+@check
+def pipelined_output_flushed_per_declaration() -> None:
+    """Pipelined runs write out the output of each declaration once it has run, and before later syntax errors."""
+    log: List[Tuple[str, str]] = list()
+    lox = Lox(Debug.REDUCED_ERROR_REPORTING, output=StreamSink(_RecordingStream("out", log)))
+    with contextlib.redirect_stderr(_RecordingStream("err", log)):
+        try:
+            lox.run('print 1;\nprint 2;\nvar = 3;\nprint 4;', pipelined=True)
+        except LoxExit:
+            pass
+    assert log[:2] == [("out", "1\n"), ("out", "2\n")], log
+    assert log[2] == ("err", "[line 3] LoxSyntaxError at '=': Expect variable name."), log
+    assert all(stream == "err" for stream, _ in log[2:]), log
+
+
+@check
+def pipelined_errors() -> None:
+    """Pipelined runs report every syntax error but stop at a runtime error. Either way, the output printed
+    before an error appears before its report, nothing is executed after it, and the run exits with status 1."""
+    cases = (
+        (
+            'print 1;\nvar = 2;\nprint 3;\nprint;',
+            [
+                ("out", "1\n"),
+                ("err", "[line 2] LoxSyntaxError at '=': Expect variable name."),
+                ("err", "[line 4] LoxSyntaxError at ';': Expect expression."),
+            ]
+        ),
+        (
+            'print 1;\nprint -"a";\nprint 3;\nvar = 4;',
+            [("out", "1\n"), ("err", "[line 2] LoxRuntimeError at '-': Operand must be a number.")]
+        ),
+    )
+    for source, expected in cases:
+        log: List[Tuple[str, str]] = list()
+        lox = Lox(Debug.REDUCED_ERROR_REPORTING, output=StreamSink(_RecordingStream("out", log)))
+        with contextlib.redirect_stderr(_RecordingStream("err", log)):
+            try:
+                lox.run(source, pipelined=True)
+            except LoxExit as exit_request:
+                status = exit_request.code
+            else:
+                status = 0
+        assert [entry for entry in log if entry != ("err", "\n")] == expected, log
+        assert status == 1, status
+
+
+class _RecordingHook(InterpreterHook):
+    def __init__(self) -> None:
+        self.events: List[Tuple[Any, ...]] = list()
+
+    def on_call(self, function: LoxFunction, args: Sequence[LoxObject]) -> None:
+        self.events.append(("call", str(function), tuple(args)))
+
+    def on_return(self, function: LoxFunction, value: LoxObject) -> None:
+        self.events.append(("return", str(function), value))
+
+    def on_statement(self, stmt: Stmt) -> None:
+        self.events.append(("statement", type(stmt).__name__))
+
+    def on_error(self, error: LoxError) -> None:
+        self.events.append(("error", error.message))
+
+
+@check
+def hook_events() -> None:
+    """Hooks observe every statement, call, return and error, and detaching the last one restores the fast path."""
+    lox = Lox(output=MemorySink())
+    hook = _RecordingHook()
+    lox.interpreter.attach_hook(hook)
+    with contextlib.redirect_stderr(io.StringIO()):
+        try:
+            lox.run('fun f(x) { return x + 1; }\nprint f(1);\nprint -"a";')
+        except LoxExit:
+            pass
+    assert hook.events == [
+        ("statement", "VariableDeclarationStmt"),
+        ("statement", "PrintStmt"),
+        ("call", "<function(arg)>", (1.0,)),
+        ("statement", "GroupingDirective"),
+        ("statement", "ReturnStmt"),
+        ("return", "<function(arg)>", 2.0),
+        ("statement", "PrintStmt"),
+        ("error", "Operand must be a number."),
+    ], hook.events
+
+    lox.interpreter.detach_hook(hook)
+    hook.events.clear()
+    lox.run("fun f() {} f();")
+    assert not hook.events, hook.events
+    assert not {"_execute", "_call"} & set(vars(lox.interpreter)), "Detaching left the traced methods in place."
+
+
+@check
+def run_timings() -> None:
+    """`Debug.TIMINGS` records each phase of a run, counting tokens and AST nodes where they are known."""
+    lox = Lox(Debug.TIMINGS, output=MemorySink())
+    cases = (
+        (False, [("lex", 6), ("parse", 4), ("resolve", None), ("execute", None)]),
+        (True, [("lex", 6), ("pipeline", None)]),
+    )
+    for pipelined, phases in cases:
+        with contextlib.redirect_stdout(io.StringIO()) as dump:
+            lox.run("print 1 + 2;", pipelined=pipelined)
+        timings = lox.last_timings
+        assert timings is not None
+        assert [(phase.name, phase.count) for phase in timings.phases] == phases, timings.phases
+        assert timings.token_count == 6 and timings.node_count == phases[1][1], timings
+        assert all(phase.wall_time >= 0 and phase.peak_memory >= 0 for phase in timings.phases), timings.phases
+        assert dump.getvalue().count("\n") == len(phases) + 3, dump.getvalue()  # Header, phases, total and footer.
+
+
+@check
+def coverage_report() -> None:
+    """Coverage counts executions per line, flags executable lines that never ran and skips the others."""
+    lox = Lox(output=MemorySink())
+    lox.enable_coverage()
+    lox.run(
+        "var i = 0;\n"
+        "while (i < 3)\n"
+        "    i = i + 1;\n"
+        "if (i > 5)\n"
+        "    print i;\n"
+        "\n"
+        "fun f() {\n"
+        "    return 1;\n"
+        "}\n"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        prefix = str(Path(directory) / "coverage")
+        lox.coverage_report().write(prefix)
+        report = json.loads(Path(f"{prefix}.json").read_text())
+        listing = Path(f"{prefix}.txt").read_text().splitlines()
+    assert report == {
+        "executable_lines": 7,
+        "covered_lines": 5,
+        "lines": {"1": 1, "2": 1, "3": 3, "4": 1, "5": 0, "7": 1, "8": 0},
+    }, report
+    assert listing[2].split()[:2] == ["3", "##########"], listing[2]
+    assert listing[4].split()[0] == "#####" and listing[5].split() == ["6", "|"], listing[4:6]
+
+
+@check
+def lines_of_path_closes_file() -> None:
+    """`lines(path)` closes the file it opened once all of its lines are read; `lines(file)` leaves it open."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "lines.txt"
+        path.write_text("a\nb\n")
+        for opened, unclosed in (('"{path}"', 0), ('open("{path}", "r")', 1)):
+            source = f"var it = lines({opened.format(path=path.as_posix())}); while (next(it) != nil) {{}}"
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always", ResourceWarning)
+                lox = Lox()
+                lox.run(source)
+                del lox
+                gc.collect()
+            found = sum(issubclass(warning.category, ResourceWarning) for warning in caught)
+            assert found == unclosed, f"{source!r} left {found} files unclosed."
+
+
+@check
+def allocations_reachable_through_collections() -> None:
+    """Concatenation results kept in lists, and as keys or values of maps, are reported as live."""
+    lox = Lox(Debug.ALLOCATIONS)
+    lox.run(
+        'var long = "' + "x" * 80 + '";\n'
+        'var strings = [];\n'
+        'for (var i = 0; i < 50; i = i + 1) {\n'
+        '    long = long + "x";\n'
+        '    push(strings, long + "y");\n'
+        '}\n'
+        'var m = map();\n'
+        'm[long + "k"] = long + "v";\n'
+    )
+    lines = {site.line: site.count for site in lox.allocation_snapshot().sites if site.kind == "string"}
+    assert lines == {4: 1, 5: 50, 8: 2}, lines
+
+
+@check
+def server_round_trip() -> None:
+    """A server runs scripts sent as source or by path, preloaded or not, and returns their output, errors and
+    exit code, which `--connect` forwards."""
+    with tempfile.TemporaryDirectory() as directory:
+        socket_path = str(Path(directory) / "pylox.sock")
+        preloaded, unloaded = Path(directory) / "preloaded.lox", Path(directory) / "unloaded.lox"
+        preloaded.write_text('print "preloaded";')
+        unloaded.write_text('print "unloaded"; print -"a";')
+        command = (sys.executable, "-m", "pylox", "--serve", socket_path, "--preload", str(preloaded))
+        server = subprocess.Popen(command, env=PYLOX_ENVIRONMENT)
+        try:
+            deadline = time.monotonic() + 30
+            while not os.path.exists(socket_path):
+                assert server.poll() is None and time.monotonic() < deadline, "The server did not start."
+                time.sleep(0.01)
+
+            response = client.request(socket_path, source='print "hello"; print 1 + 2;')
+            assert response == {"output": "hello\n3\n", "errors": "", "exit_code": 0}, response
+            response = client.request(socket_path, path=str(preloaded))
+            assert response == {"output": "preloaded\n", "errors": "", "exit_code": 0}, response
+            response = client.request(socket_path, path=str(unloaded))
+            assert response["output"] == "unloaded\n" and response["exit_code"] == 1, response
+            assert "Operand must be a number." in response["errors"], response
+            response = client.request(socket_path, source="print;")
+            assert response["output"] == "" and response["exit_code"] == 1, response
+            assert "Expect expression." in response["errors"], response
+
+            forwarded = subprocess.run(
+                (sys.executable, "-m", "pylox", "--connect", socket_path, str(unloaded)),
+                env=PYLOX_ENVIRONMENT, capture_output=True, text=True, check=False
+            )
+            assert forwarded.stdout == "unloaded\n" and forwarded.returncode == 1, forwarded
+            assert "Operand must be a number." in forwarded.stderr, forwarded
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+        assert not os.path.exists(socket_path), "The server left its socket behind."
+
+
+class _GarbageCollectionReportingServer(PyloxServer):
+    def execute(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        state = {"enabled": gc.isenabled(), "frozen": gc.get_freeze_count() > 0, "pid": os.getpid()}
+        return {"output": json.dumps(state), "errors": "", "exit_code": 0}
+
+
+@check
+def server_workers_collect_garbage() -> None:
+    """Workers run with the collector enabled, while the server keeps it disabled and its heap frozen."""
+    with tempfile.TemporaryDirectory() as directory:
+        server = _GarbageCollectionReportingServer(str(Path(directory) / "pylox.sock"))
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            worker = json.loads(client.request(server.socket_path, source="")["output"])
+            server_enabled = gc.isenabled()
+        finally:
+            server.shutdown()
+            thread.join()
+            server.server_close()
+            gc.unfreeze()
+            gc.enable()
+    assert worker["pid"] != os.getpid() and worker["enabled"] and worker["frozen"], worker
+    assert not server_enabled, "The server re-enabled its collector."
+
+
+@check
+def batch_summary() -> None:
+    """A batch runs every script under a directory, reports its failures and exits with 1 if there are any."""
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory) / "scripts"
+        (root / "nested").mkdir(parents=True)
+        (root / "ok.lox").write_text("print 1;")
+        (root / "nested" / "runtime.lox").write_text('print 2; print -"a";')
+        (root / "syntax.lox").write_text("print;")
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            assert run_batch(str(root), jobs=2) == 1
+        summary = stdout.getvalue()
+        assert summary.startswith("[nested/runtime.lox] 2\n[ok.lox] 1\n"), summary
+        assert "3 jobs run in " in summary and ", 2 failed." in summary, summary
+        assert "FAILED (1): nested/runtime.lox\n\tFAILED (1): syntax.lox\n" in summary, summary
+        assert "[nested/runtime.lox] " in stderr.getvalue() and "[syntax.lox] " in stderr.getvalue(), stderr
+
+        output = Path(directory) / "output"
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert run_batch(str(root), jobs=2, output_directory=str(output)) == 1
+        assert (output / "ok.out").read_text() == "1\n" and not (output / "ok.err").exists()
+        assert (output / "nested" / "runtime.out").read_text() == "2\n"
+        assert "Operand must be a number." in (output / "nested" / "runtime.err").read_text()
+
+        for path in (root / "nested" / "runtime.lox", root / "syntax.lox"):
+            path.unlink()
+        with contextlib.redirect_stdout(io.StringIO()) as stdout:
+            assert run_batch(str(root), jobs=2) == 0
+        assert "1 jobs run in " in stdout.getvalue() and ", 0 failed." in stdout.getvalue(), stdout.getvalue()
+
+
+@check
+def concurrent_program_runs() -> None:
+    """Runs of one program in several threads at once produce the same output as a run on its own."""
+    program = Lox().compile(
+        "class Counter { init(start) { this.count = start; } bump() { this.count = this.count + 1; } }\n"
+        "fun adder(n) { fun add(x) { return x + n; } return add; }\n"
+        "var counter = Counter(seed);\n"
+        'var text = "";\n'
+        "var numbers = [];\n"
+        "for (var i = 0; i < 300; i = i + 1) {\n"
+        "    counter.bump();\n"
+        '    text = text + "ab";\n'
+        "    push(numbers, adder(i)(seed));\n"
+        "}\n"
+        "print counter.count;\n"
+        "print len(text);\n"
+        "print sum(numbers);\n"
+        'print -"a";\n',
+        predeclared=["seed"]
+    )
+
+    def run_once(seed: int) -> Tuple[str, str, int]:
+        result = program.run({"seed": float(seed)})
+        return result.output, result.errors, result.exit_code
+
+    expected = {seed: run_once(seed) for seed in range(4)}
+    barrier = threading.Barrier(8)
+    mismatches: List[str] = list()
+
+    def run(seed: int) -> None:
+        barrier.wait()
+        for _ in range(5):
+            if (outcome := run_once(seed)) != expected[seed]:
+                mismatches.append(f"seed {seed}: {outcome}")
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Switch threads as often as possible, to interleave the runs finely.
+    try:
+        threads = [threading.Thread(target=run, args=(number % 4,)) for number in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert expected[1][0] == "301\n600\n45150\n" and expected[1][2] == 1, expected[1]
+    assert not mismatches, mismatches
+
+
+@check
+def scheduler_interleaves_runaway_program() -> None:
+    """A short program finishes within its first time slices, although a `while (true)` loop was scheduled first."""
+    lox = Lox()
+    runaway = lox.compile(
+        "fun spin() { var i = 0; while (true) { i = i + 1; if (i == 20000) return; } }\n"
+        "spin();"
+    )
+    scheduler = Scheduler(time_slice=100)
+    scheduler.submit("runaway", runaway)
+    scheduler.submit("short", lox.compile('print "done";'))
+    results = scheduler.run()
+    assert [task.name for task in results] == ["short", "runaway"], [task.name for task in results]
+    assert results[0].result.output == "done\n" and results[0].slices == 1, results[0]
+    assert results[1].result.ok, results[1].result.errors
+
+
+@check
+def scheduler_bounds_threads() -> None:
+    """By default, no more than `DEFAULT_MAX_ACTIVE` programs, and thus threads, are alive at once."""
+    lox = Lox()
+    program = lox.compile("var i = 0; while (i < 200) i = i + 1;")
+    scheduler = Scheduler(time_slice=10)
+    for number in range(DEFAULT_MAX_ACTIVE * 2):
+        scheduler.submit(str(number), program)
+
+    baseline = threading.active_count()
+    peak = baseline
+    finished = threading.Event()
+
+    def sample() -> None:
+        nonlocal peak
+        while not finished.wait(0.001):
+            peak = max(peak, threading.active_count())
+
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    try:
+        results = scheduler.run()
+    finally:
+        finished.set()
+        sampler.join()
+    assert len(results) == DEFAULT_MAX_ACTIVE * 2, len(results)
+    assert peak - baseline - 1 <= DEFAULT_MAX_ACTIVE, f"{peak - baseline - 1} tasks were alive at once."
+
+
+def main() -> None:
+    failures = 0
+    for function in CHECKS:
+        try:
+            function()
+        except Exception as error:  # pylint: disable=broad-except
+            failures += 1
+            print(f"FAIL: {function.__name__}: {type(error).__name__}: {error}")
+        else:
+            print(f"PASS: {function.__name__}")
+    print(f"{failures} checks failed, {len(CHECKS) - failures} checks passed.")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
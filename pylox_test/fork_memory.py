@@ -0,0 +1,112 @@
+"""fork_memory.py
+
+Per-worker memory benchmark for the fork server.
+
+Compiles a large synthetic program and runs it in a number of workers, each started in one of three ways:
+    spawn:        a fresh interpreter process that imports pylox and compiles the program itself;
+    fork:         a process forked from a parent that has already compiled the program;
+    fork+freeze:  as above, with the parent's collector disabled and its heap frozen with `gc.freeze()`
+                  before forking, as done by `pylox --serve`.
+Reports the median unique set size (USS) of the workers, i.e. the memory that each of them does not
+share with any other process. Linux only, as USS is read from /proc.
+"""
+
+import gc
+import os
+import subprocess
+import sys
+from statistics import median
+from typing import Callable, Dict, List
+
+from pylox.lox import Lox
+from pylox.program import Program
+
+WORKERS = 8
+FUNCTIONS = 3000
+
+
+def make_source(functions: int = FUNCTIONS) -> str:
+    """Generate a library of functions, only a few of which are called."""
+    lines = [
+        f"fun f{i}(a, b) {{ var c = a * {i} + b; if (c > {i}) {{ return c - a; }} return c + b * 2; }}"
+        for i in range(functions)
+    ]
+    lines.append("var total = 0; for (var i = 0; i < 100; i = i + 1) { total = total + f0(i, 1); } print total;")
+    return "\n".join(lines)
+
+
+def unique_set_size() -> int:
+    """Return the USS of the current process, in kB."""
+    total = 0
+    with open("/proc/self/smaps_rollup", "r") as fil:
+        for line in fil:
+            if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                total += int(line.split()[1])
+    return total
+
+
+def _run_forked(program: Program, freeze: bool) -> List[int]:
+    if freeze:
+        gc.disable()
+        gc.freeze()
+    readers: List[int] = list()
+    for _ in range(WORKERS):
+        reader, writer = os.pipe()
+        if (pid := os.fork()) == 0:
+            os.close(reader)
+            if freeze:
+                gc.enable()
+            program.run()
+            gc.collect()  # A worker collects at some point; make sure that it does here.
+            os.write(writer, str(unique_set_size()).encode())
+            os._exit(0)  # pylint: disable=protected-access
+        os.close(writer)
+        readers.append(reader)
+        os.waitpid(pid, 0)  # Run workers one at a time so that no two of them are measured together.
+    sizes = [int(os.read(reader, 64)) for reader in readers]
+    for reader in readers:
+        os.close(reader)
+    if freeze:
+        gc.unfreeze()
+        gc.enable()
+    return sizes
+
+
+def _run_spawned(source_path: str) -> List[int]:
+    script = (
+        "import gc, sys\n"
+        "from pylox.lox import Lox\n"
+        "from pylox_test.fork_memory import unique_set_size\n"
+        f"Lox().compile(open({source_path!r}).read()).run()\n"
+        "gc.collect()\n"
+        "print(unique_set_size())\n"
+    )
+    return [
+        int(subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout)
+        for _ in range(WORKERS)
+    ]
+
+
+def main() -> None:
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        sys.exit("This benchmark requires /proc/self/smaps_rollup (Linux).")
+    source = make_source()
+    source_path = os.path.abspath("fork_memory_benchmark.lox")
+    with open(source_path, "w") as fil:
+        fil.write(source)
+    try:
+        program = Lox().compile(source)
+        modes: Dict[str, Callable[[], List[int]]] = {
+            "spawn": lambda: _run_spawned(source_path),
+            "fork": lambda: _run_forked(program, freeze=False),
+            "fork+freeze": lambda: _run_forked(program, freeze=True),
+        }
+        print(f"Median USS of {WORKERS} workers running a program of {FUNCTIONS} functions:")
+        for name, run in modes.items():
+            print(f"\t{name:<12} {median(run()) / 1024:>8.2f} MiB")
+    finally:
+        os.remove(source_path)
+
+
+if __name__ == "__main__":
+    main()
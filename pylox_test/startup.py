@@ -0,0 +1,76 @@
+"""startup.py
+
+Cold-start benchmark for Pylox.
+
+Measures the time taken by `python -m pylox` to run an empty script, over and above a bare
+Python interpreter, and breaks the import time of pylox's modules down with `-X importtime`.
+Exits with a non-zero status if the startup overhead exceeds the budget.
+"""
+
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from typing import Dict, List, Sequence
+
+# Startup overhead of pylox over a bare interpreter, in milliseconds. Before the import-time work this
+# stood at roughly 110 ms; most of what remains is `typing` and building the parser and interpreter classes.
+STARTUP_BUDGET_MS = 75.0
+RUNS = 15
+
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def time_command(command: Sequence[str], runs: int = RUNS) -> float:
+    """Return the median wall time of a command, in milliseconds."""
+    samples: List[float] = list()
+    for _ in range(runs):
+        start = perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        samples.append((perf_counter() - start) * 1000)
+    return median(samples)
+
+
+def import_times(command: Sequence[str]) -> Dict[str, int]:
+    """Return the cumulative import time of each pylox module, in microseconds."""
+    stderr = subprocess.run(
+        [command[0], "-X", "importtime", *command[1:]],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True
+    ).stderr
+    times: Dict[str, int] = dict()
+    for line in stderr.splitlines():
+        if (match := IMPORT_TIME_LINE.match(line)) and match.group(4).startswith("pylox"):
+            times[match.group(4)] = int(match.group(2))
+    return times
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        script = Path(directory) / "empty.lox"
+        script.write_text("")
+        pylox_command = (sys.executable, "-m", "pylox", str(script))
+
+        bare = time_command((sys.executable, "-c", "pass"))
+        pylox = time_command(pylox_command)
+        modules = import_times(pylox_command)
+
+    print("Cumulative import time of pylox modules:")
+    for name, micros in sorted(modules.items(), key=lambda item: -item[1]):
+        print(f"\t{micros / 1000:>8.2f} ms  {name}")
+    overhead = pylox - bare
+    print(f"\nBare interpreter startup:  {bare:>8.2f} ms")
+    print(f"Pylox startup:             {pylox:>8.2f} ms")
+    print(f"Overhead:                  {overhead:>8.2f} ms (budget: {STARTUP_BUDGET_MS:.2f} ms)")
+    if overhead > STARTUP_BUDGET_MS:
+        print("Startup budget exceeded!")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,14 +11,19 @@ As such, this file is distributed under the MIT license.
 
 import os
 import re
+import shutil
 import sys
-from contextlib import contextmanager, redirect_stderr, redirect_stdout, suppress
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, redirect_stderr, suppress
 from io import StringIO
 from operator import eq
 from pathlib import Path
-from typing import Collection, Iterable, List, Optional, Sequence, TypeVar
+from typing import Collection, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
 
+from pylox.language.lox_vec import VECTORS_AVAILABLE
 from pylox.lox import Lox
+from pylox.runtime.output import MemorySink
 from pylox.utilities import indent
 from pylox.utilities.configuration import Debug
 from pylox.utilities.error import LoxExit
@@ -44,6 +49,7 @@ OUTPUT_EXPECT = re.compile(r'// expect: ?(.*)')
 ERROR_EXPECT = re.compile(r'// Error at ((end|\'[^\']+\')(.*))')
 ERROR_LINE_EXPECT = re.compile(r'// \[(java )?line (\d+)\] Error at ((end|\'[^\']+\')(.*))')
 RUNTIME_ERROR_EXPECT = re.compile(r'// expect runtime error: (.+)')
+STDIN_LINE = re.compile(r'// stdin: ?(.*)')  # A line of the test's standard input, which is empty by default.
 
 OUT_ERROR_PARSER = re.compile(r'\[line (\d+)\] (LoxSyntaxError|LoxRuntimeError)( at .*):(.*)')
 
@@ -53,18 +59,20 @@ class Test:
         self.path = path.resolve()
         self._expected_output: List[str] = list()
         self._expected_errors: List[str] = list()
+        self._stdin_lines: List[str] = list()
 
     def execute(self, lox_instance: Lox, out_buf: StringIO) -> bool:
         lox_instance.interpreter.reinitialize_environment()
-
-        out_capture = StringIO()
+        out_capture = lox_instance.interpreter.output
+        assert isinstance(out_capture, MemorySink)
+        out_capture.clear()
         err_capture = StringIO()
         with self.path.open("r") as fil:
             source = fil.read()
 
         self._compute_expected_output(source)
 
-        with suppress(LoxExit), redirect_stderr(err_capture), redirect_stdout(out_capture):
+        with suppress(LoxExit), redirect_stderr(err_capture), redirect_stdin(self._stdin_lines):
             lox_instance.run(source)
 
         out = tuple(line.strip() for line in out_capture.getvalue().splitlines())
@@ -83,6 +91,8 @@ class Test:
         # TODO: support "Error at "symbol" expectations.
         expect_runtime_error = list()
         for line_number, line in enumerate(source.splitlines(), start=1):
+            if match := STDIN_LINE.search(line):
+                self._stdin_lines.append(match.group(1))
             if match := OUTPUT_EXPECT.search(line):
                 self._expected_output.append(match.group(1))
             if match := ERROR_EXPECT.search(line):
@@ -112,6 +122,55 @@ class Test:
         raise RuntimeError(f"Unexpected error output format: {err}")
 
 
+@contextmanager
+def redirect_stdin(lines: Sequence[str]) -> Iterator[None]:
+    """Feed `lines` to the standard input, so that tests never wait on the terminal."""
+    original_stdin = sys.stdin
+    sys.stdin = StringIO("".join(f"{line}\n" for line in lines))
+    try:
+        yield
+    finally:
+        sys.stdin = original_stdin
+
+
+@contextmanager
+def scratch_directory(fixtures: Path) -> Iterator[None]:
+    """Work in a temporary directory holding a copy of the fixtures, so that tests may write files freely."""
+    original_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        shutil.copytree(fixtures, Path(directory) / fixtures.name)
+        os.chdir(directory)
+        try:
+            yield
+        finally:
+            os.chdir(original_directory)
+
+
+def new_lox_instance() -> Lox:
+    return Lox(Debug.JAVA_STYLE_TOKENS | Debug.REDUCED_ERROR_REPORTING, output=MemorySink())
+
+
+def run_test(lox_instance: Lox, test: Test) -> Tuple[bool, str]:
+    """Execute a test, returning whether it passed and its formatted report."""
+    out_buf = StringIO()
+    result = test.execute(lox_instance, out_buf)
+    return result, out_buf.getvalue()
+
+
+# Each worker process of a parallel run owns a single Lox instance, reused across the tests it is handed.
+_worker_lox_instance: Optional[Lox] = None
+
+
+def _initialize_worker() -> None:
+    global _worker_lox_instance  # pylint: disable=global-statement, invalid-name
+    _worker_lox_instance = new_lox_instance()
+
+
+def _run_test_in_worker(test: Test) -> Tuple[bool, str]:
+    assert _worker_lox_instance is not None
+    return run_test(_worker_lox_instance, test)
+
+
 class Tester:
     TEST_PATHS = (
         "assignment",
@@ -145,11 +204,13 @@ class Tester:
         "function/print.lox",  # No `clock()` function yet.
         "function/too_many_arguments.lox",  # Arbitrary restrictions are not implemented.
         "function/too_many_parameters.lox",  # Arbitrary restrictions are not implemented.
+        *(() if VECTORS_AVAILABLE else ("../test_suite_extensions/vec", )),  # Vectors require NumPy.
     )
 
-    def __init__(self) -> None:
+    def __init__(self, jobs: int = 1) -> None:
         self._queued_tests: List[Test] = list()
-        self._lox_instance = Lox(Debug.JAVA_STYLE_TOKENS | Debug.REDUCED_ERROR_REPORTING)
+        self._jobs = jobs
+        self._lox_instance = new_lox_instance()
         self._fails_output = StringIO()
 
         self._test_root = Path(os.path.realpath(__file__)).parent / "test_suite"
@@ -170,14 +231,14 @@ class Tester:
         test_count = len(self._queued_tests)
         test_count_str_len = len(str(test_count))
 
-        for num, test in enumerate(self._queued_tests, start=1):
-            out_buf = StringIO()
-            print(f"{num:>{test_count_str_len}}/{test_count} ", end="", file=out_buf)
-            result = test.execute(self._lox_instance, out_buf)
-            print(out_buf.getvalue().rstrip())
-            if not result:
-                errors += 1
-                print(f"{out_buf.getvalue().rstrip()}\n", file=self._fails_output)
+        # Tests run in a scratch directory, where they find the fixtures under `fixtures/`.
+        with scratch_directory(Path(os.path.realpath(__file__)).parent / "fixtures"):
+            for num, (result, report) in enumerate(self._run_queued_tests(), start=1):
+                report = f"{num:>{test_count_str_len}}/{test_count} {report}".rstrip()
+                print(report)
+                if not result:
+                    errors += 1
+                    print(f"{report}\n", file=self._fails_output)
 
         if errors:
             print(f"\nThe following tests {red('failed')}:\n\n{self._fails_output.getvalue()}", end="")
@@ -190,6 +251,18 @@ class Tester:
             print(f"\nAll {test_count} tests {green('passed')}!")
             sys.exit()
 
+    def _run_queued_tests(self) -> Iterator[Tuple[bool, str]]:
+        """Execute the queued tests, yielding their results in queue order.
+
+        With more than one job, tests are spread across a pool of worker processes, each with its own
+        Lox instance. Results are still yielded in order, as soon as all preceding tests have completed."""
+        if self._jobs <= 1:
+            for test in self._queued_tests:
+                yield run_test(self._lox_instance, test)
+            return
+        with ProcessPoolExecutor(max_workers=self._jobs, initializer=_initialize_worker) as executor:
+            yield from executor.map(_run_test_in_worker, self._queued_tests, chunksize=4)
+
     @contextmanager
     def _apply_special_options(self, *options: Debug):  # type: ignore
         for option in options:
@@ -200,9 +273,10 @@ class Tester:
 
     def _discover_and_queue_tests(self, path: Path, ignored: Iterable[Path]) -> None:
         assert path.exists()
+        if path in ignored:
+            return
         if path.is_dir():
             for sub_path in sorted(path.iterdir()):
                 self._discover_and_queue_tests(path / sub_path, ignored)
         else:  # Is file.
-            if path not in ignored:
-                self._queued_tests.append(Test(path))
+            self._queued_tests.append(Test(path))
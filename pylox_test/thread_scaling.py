@@ -0,0 +1,72 @@
+"""thread_scaling.py
+
+Thread scaling benchmark for Pylox.
+
+Runs a single compiled `Program` concurrently from 1 to N threads, each run on its own interpreter,
+and reports the throughput at every thread count relative to a single thread. On a free-threaded
+build of CPython (3.13t and later), throughput should scale with the number of cores; on a build with
+the GIL it stays roughly flat. Every run's output is checked against that of a sequential run.
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import List
+
+from pylox.lox import Lox
+from pylox.program import Program
+
+RUNS_PER_THREAD = 4
+
+SOURCE = """
+class Accumulator {
+    init() { this.total = 0; }
+    add(value) { this.total = this.total + value; return this; }
+}
+
+fun fib(n) { if (n < 2) return n; return fib(n - 1) + fib(n - 2); }
+
+var accumulator = Accumulator();
+for (var i = 0; i < 12; i = i + 1) {
+    accumulator.add(fib(i));
+}
+print accumulator.total;
+print fib(13);
+"""
+
+
+def gil_enabled() -> bool:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def measure(program: Program, threads: int, expected: str) -> float:
+    """Return the number of runs completed per second with `threads` threads."""
+    def worker(_: int) -> List[str]:
+        return [program.run().output for _ in range(RUNS_PER_THREAD)]
+
+    start = perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        outputs = [output for outputs in executor.map(worker, range(threads)) for output in outputs]
+    elapsed = perf_counter() - start
+    if any(output != expected for output in outputs):
+        sys.exit(f"Output of a concurrent run differs from that of a sequential run with {threads} threads!")
+    return len(outputs) / elapsed
+
+
+def main() -> None:
+    max_threads = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    program = Lox().compile(SOURCE)
+    expected = program.run().output
+
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil_enabled() else 'disabled'}.")
+    baseline = measure(program, 1, expected)
+    print(f"\t{1:>3} threads: {baseline:>8.2f} runs/s")
+    for threads in range(2, max_threads + 1):
+        throughput = measure(program, threads, expected)
+        print(f"\t{threads:>3} threads: {throughput:>8.2f} runs/s ({throughput / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()